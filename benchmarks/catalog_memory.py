@@ -0,0 +1,172 @@
+"""
+Per-job memory of the job catalog: parsed job dicts plus the old
+metadata-carrying index documents, against the columnar JobTable and the
+row-index-only JobDocuments; and peak memory of loading a jobs file
+(whole-file json.loads vs streaming) and of building its job index.
+
+Memory is measured with tracemalloc: "retained" is what stays allocated
+once the structure is built, "peak" includes the transient parse. Mapped
+vector files are page cache, not heap, so they are not counted.
+
+    python -m benchmarks.catalog_memory --sizes 1000 10000 100000 --output mem.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import job_index
+from benchmarks.fakes import HashEmbeddings
+from benchmarks.pipeline import _commit, _quiet
+from benchmarks.synthetic import generate_jobs
+from catalog import CatalogSnapshot, JobCatalog, JobTable, parse_jobs
+from langchain_core.documents import Document
+from matching import JobDocuments, create_job_text
+
+
+def _dict_documents(jobs: List[Dict]) -> List[Document]:
+    """Index documents as built before JobTable: job fields copied into metadata"""
+    return [
+        Document(
+            page_content=create_job_text(job),
+            metadata={
+                "job_id": job["job_id"],
+                "title": job["title"],
+                "company": job["company"],
+                "category": job.get("category", "tech"),
+                "experience_level": job.get("experience_level", "Entry"),
+                "location": job.get("location", "Remote"),
+                "requirements": job.get("requirements", []),
+                "automation_allowed": job.get("automation_allowed", True),
+                "full_job": job,
+            },
+        )
+        for job in jobs
+    ]
+
+
+def _dicts(raw: bytes):
+    jobs = parse_jobs(json.loads(raw))
+    return jobs, _dict_documents(jobs)
+
+
+def _table(raw: bytes):
+    table = JobTable(parse_jobs(json.loads(raw)))
+    return table, JobDocuments(table)
+
+
+def _snapshot(raw: bytes):
+    return CatalogSnapshot("bench", parse_jobs(json.loads(raw)), "bench", (0, 0))
+
+
+def _read_whole(path: str):
+    """Catalog load before streaming: whole file, then json.loads"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return CatalogSnapshot(path, parse_jobs(json.loads(raw)), "bench", (0, 0))
+
+
+def _read_streaming(path: str):
+    with _quiet():
+        return JobCatalog(path).snapshot()
+
+
+def measure(size: int, name: str, build: Callable, source, repeat: bool = True) -> Dict:
+    wall = None
+    if repeat:
+        gc.collect()
+        start = time.perf_counter()
+        build(source)
+        wall = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    built = build(source)
+    traced_wall = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+
+    row = {
+        "size": size,
+        "layout": name,
+        "build_s": round(wall if wall is not None else traced_wall, 4),
+        "retained_mb": round(retained / 2**20, 3),
+        "peak_mb": round(peak / 2**20, 3),
+        "bytes_per_job": round(retained / size),
+    }
+    print(json.dumps(row), flush=True)
+    return row
+
+
+def measure_access(size: int, table: JobTable, samples: int = 10000) -> Dict:
+    """Cost of materializing one job dict from the table"""
+    rows = [i * 7919 % size for i in range(samples)]
+    start = time.perf_counter()
+    for row in rows:
+        table[row]
+    per_row = (time.perf_counter() - start) / samples
+    row = {"size": size, "layout": "jobtable_row_access", "us_per_row": round(per_row * 1e6, 2)}
+    print(json.dumps(row), flush=True)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--dim", type=int, default=768, help="stand-in embedding dimension")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="catalog-memory-bench-")
+    embeddings = HashEmbeddings(args.dim)
+
+    def build_index(table: JobTable):
+        # Fresh directory each time: everything is embedded and written
+        with _quiet():
+            return job_index.load_job_index(
+                JobDocuments(table), embeddings, index_dir=tempfile.mkdtemp(dir=work_dir)
+            )
+
+    results = []
+    for size in args.sizes:
+        raw = json.dumps({"jobs": generate_jobs(size, seed=args.seed)}).encode("utf-8")
+        results.append(measure(size, "dicts+documents", _dicts, raw))
+        results.append(measure(size, "jobtable+documents", _table, raw))
+        results.append(measure(size, "catalog_snapshot", _snapshot, raw))
+        results.append(measure_access(size, _table(raw)[0]))
+
+        path = os.path.join(work_dir, f"jobs-{size}.json")
+        with open(path, "wb") as f:
+            f.write(raw)
+        results.append(measure(size, "ingest_whole_file", _read_whole, path))
+        results.append(measure(size, "ingest_streaming", _read_streaming, path))
+        results.append(
+            measure(size, "index_build", build_index, _table(raw)[0], repeat=False)
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "commit": _commit(),
+                    "python": platform.python_version(),
+                    "params": vars(args),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Deterministic local stand-ins for the Gemini embedding and chat models.
+
+Both plug into the same code paths as the real clients (the `embeddings` /
+`llm` arguments of matching.match_jobs_with_ai and friends), so benchmarks
+exercise the real pipeline without network calls or API keys.
+"""
+
+import asyncio
+import hashlib
+import re
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from models import MatchReasoning, MatchReasoningBatch
+
+_TOKEN = re.compile(r"[a-z0-9+#.]+")
+
+
+class HashEmbeddings(Embeddings):
+    """
+    Signed feature hashing of lowercase tokens into `dim` buckets. Texts
+    sharing words get similar vectors, so rankings are meaningful.
+    """
+
+    def __init__(self, dim: int = 768):
+        self.dim = dim
+        self.documents_embedded = 0
+        self.queries_embedded = 0
+
+    def _bucket(self, token: str):
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dim, 1.0 if value >> 63 else -1.0
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in _TOKEN.findall(text.lower()):
+            bucket, sign = self._bucket(token)
+            vector[bucket] += sign
+        if not vector.any():
+            vector[0] = 1.0
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str], **kwargs) -> List[List[float]]:
+        self.documents_embedded += len(texts)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str, **kwargs) -> List[float]:
+        self.queries_embedded += 1
+        return self._embed(text)
+
+
+class _Message:
+    def __init__(self, content: str):
+        self.content = content
+
+
+def _reasoning_for(prompt: str, label: str) -> str:
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+    return f"Stand-in reasoning for {label} ({digest})."
+
+
+class FakeChatModel:
+    """
+    Chat model answering instantly (or after `latency` seconds on the async
+    path) with text derived from the prompt. Counts requests.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+
+    def _answer(self, prompt: str) -> _Message:
+        self.requests += 1
+        title = re.search(r"^Title: (.*)$", prompt, re.M)
+        return _Message(_reasoning_for(prompt, title.group(1) if title else "job"))
+
+    def invoke(self, prompt, **kwargs) -> _Message:
+        return self._answer(str(prompt))
+
+    async def ainvoke(self, prompt, **kwargs) -> _Message:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._answer(str(prompt))
+
+    def with_structured_output(self, schema):
+        if schema is not MatchReasoningBatch:
+            raise NotImplementedError(f"No stand-in output for {schema.__name__}")
+        return _FakeStructuredReasoning(self)
+
+
+class _FakeStructuredReasoning:
+    def __init__(self, model: FakeChatModel):
+        self.model = model
+
+    def _answer(self, prompt: str) -> MatchReasoningBatch:
+        self.model.requests += 1
+        return MatchReasoningBatch(
+            items=[
+                MatchReasoning(job_id=job_id, reasoning=_reasoning_for(prompt, job_id))
+                for job_id in re.findall(r"^JOB (\S+):$", prompt, re.M)
+            ]
+        )
+
+    def invoke(self, prompt, **kwargs) -> MatchReasoningBatch:
+        return self._answer(str(prompt))
+
+    async def ainvoke(self, prompt, **kwargs) -> MatchReasoningBatch:
+        if self.model.latency:
+            await asyncio.sleep(self.model.latency)
+        return self._answer(str(prompt))
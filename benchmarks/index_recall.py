@@ -0,0 +1,117 @@
+"""
+Recall@k and latency of the approximate job index modes against exact search.
+
+Uses synthetic clustered, L2-normalized vectors shaped like job embeddings
+and the same build_faiss_index / IndexConfig the API uses, so the numbers
+carry over to JOB_INDEX_TYPE / JOB_INDEX_EF_SEARCH / JOB_INDEX_NPROBE.
+
+    python -m benchmarks.index_recall --n 100000 --dim 768 --output recall.json
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from job_index import IndexConfig, build_faiss_index, normalize_rows
+
+
+def synthetic_vectors(n: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype("float32")
+    assignment = rng.integers(0, clusters, size=n)
+    noise = rng.standard_normal((n, dim)).astype("float32")
+    return normalize_rows(centers[assignment] + 0.6 * noise)
+
+
+def measure(index, config: IndexConfig, queries: np.ndarray, exact: np.ndarray, k: int) -> Dict:
+    params = config.search_params()
+    latencies = []
+    found = []
+    for query in queries:
+        start = time.perf_counter()
+        _, rows = index.search(query[None, :], k, params=params)
+        latencies.append(time.perf_counter() - start)
+        found.append(rows[0])
+
+    recall = np.mean(
+        [len(set(f) & set(e)) / k for f, e in zip(found, exact)]
+    )
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        f"recall@{k}": round(float(recall), 4),
+        "latency_ms_mean": round(float(latencies_ms.mean()), 4),
+        "latency_ms_p50": round(float(np.percentile(latencies_ms, 50)), 4),
+        "latency_ms_p95": round(float(np.percentile(latencies_ms, 95)), 4),
+    }
+
+
+def run(args) -> List[Dict]:
+    vectors = synthetic_vectors(args.n, args.dim, args.clusters, args.seed)
+    queries = synthetic_vectors(args.queries, args.dim, args.clusters, args.seed)
+
+    results = []
+
+    def record(config: IndexConfig, index, build_seconds: float, exact):
+        row = {
+            "type": config.type,
+            "spec": config.spec(args.n),
+            "ef_search": config.ef_search if config.type == "hnsw" else None,
+            "nprobe": config.nprobe if config.type == "ivf" else None,
+            "build_s": round(build_seconds, 3),
+            **measure(index, config, queries, exact, args.k),
+        }
+        results.append(row)
+        print(json.dumps(row))
+
+    def build(config: IndexConfig):
+        start = time.perf_counter()
+        index = build_faiss_index(vectors, config)
+        return index, time.perf_counter() - start
+
+    # Ground truth from the exact index
+    flat_config = IndexConfig("flat")
+    flat, flat_seconds = build(flat_config)
+    _, exact = flat.search(queries, args.k)
+    record(flat_config, flat, flat_seconds, exact)
+
+    hnsw_config = IndexConfig("hnsw", hnsw_m=args.hnsw_m)
+    hnsw, hnsw_seconds = build(hnsw_config)
+    for ef_search in args.ef_search:
+        hnsw_config.ef_search = ef_search
+        record(hnsw_config, hnsw, hnsw_seconds, exact)
+
+    ivf_config = IndexConfig("ivf", nlist=args.nlist)
+    ivf, ivf_seconds = build(ivf_config)
+    for nprobe in args.nprobe:
+        ivf_config.nprobe = nprobe
+        record(ivf_config, ivf, ivf_seconds, exact)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=20000, help="catalog size")
+    parser.add_argument("--dim", type=int, default=768, help="embedding dimension")
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=60, help="results per query (top_k*2)")
+    parser.add_argument("--hnsw-m", type=int, default=32)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    parser.add_argument("--nlist", type=int, default=0, help="0 = 4*sqrt(n)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"params": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Per-stage wall time, throughput and peak memory of the matching and notes
+pipeline on synthetic catalogs, with local stand-ins for Gemini.
+
+Every stage runs the same functions the API uses; HashEmbeddings and
+FakeChatModel replace the network calls. Results are JSON lines on stdout
+and, with --output, one JSON document to compare across commits.
+
+    python -m benchmarks.pipeline --sizes 100 1000 10000 100000 --output bench.json
+"""
+
+import os
+import tempfile
+
+# Keep benchmark state out of the working tree and the shared caches; these
+# must be set before the pipeline modules read them at import time.
+_WORK_DIR = tempfile.mkdtemp(prefix="pipeline-bench-")
+os.environ.setdefault("JOB_INDEX_DIR", os.path.join(_WORK_DIR, "job_index"))
+os.environ.setdefault("REASONING_CACHE_PATH", os.path.join(_WORK_DIR, "reasoning.sqlite3"))
+os.environ.setdefault(
+    "REASONING_PROMPTS_PATH", os.path.join(_WORK_DIR, "reasoning_prompts.sqlite3")
+)
+os.environ.setdefault("MATCH_CACHE_SIZE", "0")
+os.environ.setdefault("REASONING_BACKGROUND_CONCURRENCY", "0")
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import contextlib  # noqa: E402
+import io  # noqa: E402
+import json  # noqa: E402
+import platform  # noqa: E402
+import subprocess  # noqa: E402
+import time  # noqa: E402
+import tracemalloc  # noqa: E402
+from typing import Callable, Dict, List  # noqa: E402
+
+import job_index  # noqa: E402
+from benchmarks.fakes import FakeChatModel, HashEmbeddings  # noqa: E402
+from benchmarks.synthetic import generate_artifact_pack, generate_jobs  # noqa: E402
+from catalog import JobCatalog, get_catalog  # noqa: E402
+from matching import (  # noqa: E402
+    create_ai_apply_queue,
+    create_job_documents,
+    create_student_profile_text,
+    create_vector_store,
+    embed_bullet_bank,
+    get_relevant_bullets_semantic,
+    match_jobs_with_ai,
+)
+from note import generate_recruiter_notes  # noqa: E402
+from reasoning_cache import get_reasoning_cache  # noqa: E402
+from sandbox import score_sandbox_batch  # noqa: E402
+from skills import calculate_skill_overlap  # noqa: E402
+
+
+def _quiet():
+    """Swallow the pipeline's progress prints"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def measure(stage: str, size: int, items: int, fn: Callable, memory: bool) -> Dict:
+    """
+    Time one call of `fn`; with `memory`, call it again under tracemalloc
+    for the peak (tracing slows Python code, so it is not timed).
+    """
+    with _quiet():
+        start = time.perf_counter()
+        fn()
+        wall = time.perf_counter() - start
+
+        peak_mb = None
+        if memory:
+            tracemalloc.start()
+            fn()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+
+    row = {
+        "size": size,
+        "stage": stage,
+        "items": items,
+        "wall_s": round(wall, 6),
+        "throughput_per_s": round(items / wall, 2) if wall > 0 else None,
+        "peak_mem_mb": round(peak_mb, 3) if peak_mb is not None else None,
+    }
+    print(json.dumps(row), flush=True)
+    return row
+
+
+def run_size(size: int, args, embeddings: HashEmbeddings, llm: FakeChatModel) -> List[Dict]:
+    jobs_path = os.path.join(_WORK_DIR, f"jobs-{size}.json")
+    with open(jobs_path, "w") as f:
+        json.dump({"jobs": generate_jobs(size, seed=args.seed)}, f)
+
+    packs = [generate_artifact_pack(seed=args.seed + i) for i in range(args.students)]
+    top_k = min(args.top_k, size)
+    results = []
+
+    def stage(name: str, items: int, fn: Callable):
+        results.append(measure(name, size, items, fn, args.memory))
+
+    # Catalog: parse + skill matrix + filter bitmaps
+    stage("catalog_load", size, lambda: JobCatalog(jobs_path).snapshot())
+    with _quiet():
+        catalog = get_catalog(jobs_path).snapshot()
+    automatable = catalog.automatable_jobs
+    documents = create_job_documents(automatable)
+
+    if size <= args.legacy_max:
+        stage(
+            "create_vector_store",
+            len(automatable),
+            lambda: create_vector_store(automatable, embeddings),
+        )
+
+    # Job index: embed + build from scratch, then reload from disk
+    stage(
+        "job_index_build",
+        len(documents),
+        lambda: job_index.load_job_index(
+            documents, embeddings, index_dir=tempfile.mkdtemp(dir=_WORK_DIR)
+        ),
+    )
+    index_dir = os.path.join(_WORK_DIR, f"index-{size}")
+    with _quiet():
+        index = job_index.load_job_index(documents, embeddings, index_dir=index_dir)
+
+    def reload_index():
+        job_index._loaded.clear()
+        job_index.load_job_index(documents, embeddings, index_dir=index_dir)
+
+    stage("job_index_load", len(documents), reload_index)
+
+    query_vectors = [
+        embeddings.embed_query(create_student_profile_text(pack)) for pack in packs
+    ]
+    k = min(top_k * 2, len(index))
+    stage(
+        "faiss_search",
+        len(packs),
+        lambda: [index.search(vector, k) for vector in query_vectors],
+    )
+    stage("faiss_search_batch", len(packs), lambda: index.search_batch(query_vectors, k))
+
+    skills = packs[0].profile.skills
+    stage(
+        "calculate_skill_overlap",
+        len(catalog.jobs),
+        lambda: [
+            calculate_skill_overlap(job.get("requirements", []), skills)
+            for job in catalog.jobs
+        ],
+    )
+    stage(
+        "skill_matrix_score",
+        len(catalog.jobs) * len(packs),
+        lambda: [catalog.skills.score(pack.profile.skills) for pack in packs],
+    )
+
+    bullet_vectors = [embed_bullet_bank(pack.bullet_bank, embeddings) for pack in packs]
+    top_rows = [rows for rows in index.search_batch(query_vectors, top_k)[1]]
+    stage(
+        "relevant_bullets",
+        len(packs) * top_k,
+        lambda: [
+            get_relevant_bullets_semantic(
+                index.job_vectors(rows[rows >= 0]), vectors, pack.bullet_bank, top_k=5
+            )
+            for rows, vectors, pack in zip(top_rows, bullet_vectors, packs)
+        ],
+    )
+
+    # End to end, reasoning from a fresh (empty) reasoning cache each run
+    def match_all():
+        get_reasoning_cache().clear()
+
+        async def run():
+            return [
+                await match_jobs_with_ai(
+                    pack,
+                    jobs_file_path=jobs_path,
+                    top_k=top_k,
+                    min_similarity=0,
+                    embeddings=embeddings,
+                    llm=llm,
+                    reasoning_batch_size=args.reasoning_batch_size,
+                )
+                for pack in packs
+            ]
+
+        return asyncio.run(run())
+
+    # Warm run first: builds the default-dir job index outside the timing
+    with _quiet():
+        all_matches = match_all()
+    stage("match_jobs_with_ai", len(packs), match_all)
+
+    queues = [create_ai_apply_queue(matches) for matches in all_matches]
+    artifacts = [pack.model_dump() for pack in packs]
+    stage(
+        "generate_recruiter_notes",
+        sum(len(queue["jobs"]) for queue in queues),
+        lambda: [
+            generate_recruiter_notes(artifact, [entry["job"] for entry in queue["jobs"]])
+            for artifact, queue in zip(artifacts, queues)
+        ],
+    )
+
+    notes = [
+        generate_recruiter_notes(artifact, [entry["job"] for entry in queue["jobs"]])
+        for artifact, queue in zip(artifacts, queues)
+    ]
+    stage(
+        "sandbox_scoring",
+        sum(len(queue["jobs"]) for queue in queues),
+        lambda: [
+            score_sandbox_batch(queue["jobs"], queue_notes)
+            for queue, queue_notes in zip(queues, notes)
+        ],
+    )
+
+    return results
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--students", type=int, default=5, help="artifact packs per size")
+    parser.add_argument("--top-k", type=int, default=30)
+    parser.add_argument("--dim", type=int, default=768, help="stand-in embedding dimension")
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.0, help="seconds per stand-in LLM call"
+    )
+    parser.add_argument("--reasoning-batch-size", type=int, default=1)
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=10000,
+        help="largest size to run the legacy create_vector_store stage on",
+    )
+    parser.add_argument(
+        "--no-memory",
+        dest="memory",
+        action="store_false",
+        help="skip the tracemalloc pass for peak memory",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    embeddings = HashEmbeddings(args.dim)
+    llm = FakeChatModel(args.llm_latency)
+
+    results = []
+    for size in args.sizes:
+        results.extend(run_size(size, args, embeddings, llm))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "commit": _commit(),
+                    "python": platform.python_version(),
+                    "params": vars(args),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
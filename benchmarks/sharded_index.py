@@ -0,0 +1,133 @@
+"""
+Search throughput and latency of the sharded job index by shard count.
+
+Every shard count gets its own shard pool (one process per shard) over the
+same synthetic vectors; concurrent clients then issue single-query searches
+like concurrent /match-jobs-ai requests do. BLAS is pinned to one thread
+per process (override with OMP_NUM_THREADS / OPENBLAS_NUM_THREADS), so the
+scaling comes from the shards rather than from numpy's own threads.
+
+    python -m benchmarks.sharded_index --n 1000000 --shards 1 2 4 8 --output shards.json
+"""
+
+import os
+
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import platform  # noqa: E402
+import tempfile  # noqa: E402
+import time  # noqa: E402
+from concurrent.futures import ThreadPoolExecutor  # noqa: E402
+from typing import Dict, List  # noqa: E402
+
+import numpy as np  # noqa: E402
+from langchain_core.documents import Document  # noqa: E402
+
+import job_index  # noqa: E402
+from benchmarks.index_recall import synthetic_vectors  # noqa: E402
+from benchmarks.pipeline import _commit  # noqa: E402
+
+
+class _StoredEmbeddings:
+    """Embeddings stand-in returning the pre-generated vector of row `text`"""
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = vectors
+
+    def embed_documents(self, texts: List[str], **kwargs) -> List[List[float]]:
+        return self.vectors[[int(text) for text in texts]]
+
+
+def measure(name: str, shards: int, index, queries: np.ndarray, args) -> Dict:
+    def search(query):
+        start = time.perf_counter()
+        index.search_batch([query], args.k)
+        return time.perf_counter() - start
+
+    # One untimed round so every pool process has its shards open
+    list(map(search, queries[: args.clients]))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as clients:
+        latencies = np.array(list(clients.map(search, queries))) * 1000
+    wall = time.perf_counter() - start
+
+    row = {
+        "index": name,
+        "shards": shards,
+        "n": len(index),
+        "queries": len(queries),
+        "clients": args.clients,
+        "queries_per_s": round(len(queries) / wall, 2),
+        "latency_ms_p50": round(float(np.percentile(latencies, 50)), 3),
+        "latency_ms_p95": round(float(np.percentile(latencies, 95)), 3),
+    }
+    print(json.dumps(row), flush=True)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=200000, help="indexed jobs")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--queries", type=int, default=400)
+    parser.add_argument("--clients", type=int, default=8, help="concurrent searches")
+    parser.add_argument("--k", type=int, default=60)
+    parser.add_argument("--index-type", default="flat", choices=("flat", "hnsw", "ivf"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    vectors = synthetic_vectors(args.n, args.dim, args.clusters, args.seed)
+    queries = synthetic_vectors(args.queries, args.dim, args.clusters, args.seed + 1)
+    embeddings = _StoredEmbeddings(vectors)
+    documents = [Document(page_content=str(row)) for row in range(args.n)]
+    config = job_index.IndexConfig(type=args.index_type)
+    index_dir = tempfile.mkdtemp(prefix="sharded-index-bench-")
+
+    results = []
+    single = job_index.load_job_index(
+        documents, embeddings, index_dir=index_dir, config=config
+    )
+    results.append(measure("single", 1, single, queries, args))
+
+    for shards in args.shards:
+        start = time.perf_counter()
+        sharded = job_index.load_sharded_job_index(
+            documents,
+            embeddings,
+            shards=shards,
+            index_dir=index_dir,
+            config=config,
+            hashes=single.hashes,
+            workers=shards,
+        )
+        build_s = time.perf_counter() - start
+        sharded.warm()
+        row = measure("sharded", shards, sharded, queries, args)
+        row["build_s"] = round(build_s, 3)
+        results.append(row)
+        job_index.shutdown_shard_pool()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "commit": _commit(),
+                    "python": platform.python_version(),
+                    "cpu_count": os.cpu_count(),
+                    "params": vars(args),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
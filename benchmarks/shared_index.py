@@ -0,0 +1,162 @@
+"""
+Memory and load time of the persisted job index across several worker
+processes, with the vectors and FAISS index memory-mapped or read privately.
+
+Each worker loads the same saved index (no embedding calls) and runs a few
+searches while all workers are alive; memory comes from
+/proc/self/smaps_rollup (Linux): "private" is what the worker alone holds,
+"pss" its proportional share of pages shared with the other workers.
+
+    python -m benchmarks.shared_index --jobs 100000 --workers 4 --output shared.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.pipeline import _commit
+
+_DTYPES = ("float32", "float16")
+
+
+def _memory() -> Dict[str, Optional[float]]:
+    """Private and proportional (PSS) memory of this process in MB"""
+    fields = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if value.strip().endswith("kB"):
+                    fields[name] = int(value.split()[0]) / 1024
+    except OSError:
+        return {"private_mb": None, "pss_mb": None}
+    return {
+        "private_mb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "pss_mb": fields.get("Pss"),
+    }
+
+
+def _worker(args, index_dir: str, hashes: List[str], barrier, results) -> None:
+    import job_index
+    from benchmarks.fakes import HashEmbeddings
+
+    embeddings = HashEmbeddings(args.dim)
+    queries = [embeddings.embed_query(f"python engineer {i}") for i in range(args.queries)]
+    config = job_index.IndexConfig(type=args.index_type)
+    documents = [None] * len(hashes)  # only needed to embed, which never happens here
+
+    before = _memory()
+    start = time.perf_counter()
+    index = job_index.load_job_index(
+        documents, None, index_dir=index_dir, config=config, hashes=hashes
+    )
+    load_s = time.perf_counter() - start
+    start = time.perf_counter()
+    index.search_batch(queries, 10)
+    search_s = time.perf_counter() - start
+
+    # Measure while every worker has the index loaded
+    barrier.wait()
+    after = _memory()
+    barrier.wait()
+
+    results.put(
+        {
+            "load_s": load_s,
+            "search_s": search_s,
+            "private_mb": after["private_mb"] - before["private_mb"]
+            if after["private_mb"] is not None
+            else None,
+            "pss_mb": after["pss_mb"] - before["pss_mb"] if after["pss_mb"] is not None else None,
+        }
+    )
+
+
+def run(args, mmap: bool, dtype: str, index_dir: str, hashes: List[str]) -> Dict:
+    # Workers are spawned, so they read these when importing job_index
+    os.environ["JOB_INDEX_MMAP"] = "true" if mmap else "false"
+    os.environ["JOB_VECTOR_DTYPE"] = dtype
+
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(args.workers)
+    results = context.Queue()
+    workers = [
+        context.Process(target=_worker, args=(args, index_dir, hashes, barrier, results))
+        for _ in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    rows = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    def mean(key):
+        values = [row[key] for row in rows if row[key] is not None]
+        return round(sum(values) / len(values), 4) if values else None
+
+    row = {
+        "jobs": len(hashes),
+        "workers": args.workers,
+        "index_type": args.index_type,
+        "mmap": mmap,
+        "dtype": dtype,
+        "load_s": mean("load_s"),
+        "search_s": mean("search_s"),
+        "private_mb_per_worker": mean("private_mb"),
+        "pss_mb_per_worker": mean("pss_mb"),
+    }
+    print(json.dumps(row), flush=True)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--dim", type=int, default=768, help="stand-in embedding dimension")
+    parser.add_argument("--index-type", default="flat", choices=("flat", "hnsw", "ivf"))
+    parser.add_argument("--queries", type=int, default=8, help="searches per worker")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    import job_index
+    from benchmarks.fakes import HashEmbeddings
+    from benchmarks.synthetic import generate_jobs
+    from matching import create_job_documents
+
+    documents = create_job_documents(generate_jobs(args.jobs))
+    embeddings = HashEmbeddings(args.dim)
+    config = job_index.IndexConfig(type=args.index_type)
+
+    results = []
+    for dtype in _DTYPES:
+        # Build and persist once per dtype; the workers only load
+        index_dir = tempfile.mkdtemp(prefix="shared-index-bench-")
+        job_index.JOB_VECTOR_DTYPE = dtype
+        index = job_index.load_job_index(
+            documents, embeddings, index_dir=index_dir, config=config
+        )
+        for mmap in (False, True):
+            results.append(run(args, mmap, dtype, index_dir, index.hashes))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "commit": _commit(),
+                    "python": platform.python_version(),
+                    "params": vars(args),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
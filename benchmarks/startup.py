@@ -0,0 +1,172 @@
+"""
+Cold-start cost of the API: import time, time until /ready, and the latency
+of the first and second /match-jobs-ai requests.
+
+Each run is a fresh interpreter (so imports and module state are really
+cold), serving a synthetic jobs.json with the local Gemini stand-ins. "cold"
+runs start from an empty job index directory, "warm" runs reuse the index
+persisted by a previous run.
+
+    python -m benchmarks.startup --jobs 10000 --runs 5 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+_REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the API should not import until a request needs them
+_LAZY_MODULES = ("langchain_google_genai", "pdfplumber", "bs4", "requests")
+
+
+def _child(dim: int) -> Dict:
+    """One server lifetime in this process (run with the work dir as cwd)"""
+    start = time.perf_counter()
+    import main
+
+    import_s = time.perf_counter() - start
+    eager = [name for name in _LAZY_MODULES if name in sys.modules]
+
+    import matching
+    from benchmarks.fakes import FakeChatModel, HashEmbeddings
+    from benchmarks.synthetic import generate_artifact_pack
+    from fastapi.testclient import TestClient
+
+    embeddings = HashEmbeddings(dim)
+    matching.create_embeddings = lambda api_key: embeddings
+    matching.create_reasoning_llm = lambda api_key: FakeChatModel()
+    pack = generate_artifact_pack(seed=0, seed_jobs=json.load(open("jobs.json"))["jobs"])
+
+    def match(top_k: int) -> float:
+        request_start = time.perf_counter()
+        response = client.post(
+            "/match-jobs-ai",
+            data={
+                "artifact_pack": pack.model_dump_json(),
+                "api_key": "benchmark",
+                "top_k": top_k,
+            },
+        )
+        response.raise_for_status()
+        return time.perf_counter() - request_start
+
+    with TestClient(main.app) as client:
+        while client.get("/ready").status_code != 200:
+            time.sleep(0.005)
+        ready_s = time.perf_counter() - start
+        ready = client.get("/ready").json()
+        # Different top_k so the second request misses the match cache
+        first_match_s = match(10)
+        second_match_s = match(11)
+
+    return {
+        "import_s": import_s,
+        "ready_s": ready_s,
+        "warm_up_s": ready.get("warm_up_s"),
+        "index_loaded_at_startup": ready.get("index_loaded"),
+        "first_match_s": first_match_s,
+        "second_match_s": second_match_s,
+        "documents_embedded": embeddings.documents_embedded,
+        "eager_modules": eager,
+    }
+
+
+def _run_child(work_dir: str, index_dir: str, dim: int) -> Dict:
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [_REPO_DIR, os.environ.get("PYTHONPATH")])),
+        "JOB_INDEX_DIR": index_dir,
+        "REASONING_CACHE_PATH": os.path.join(work_dir, "reasoning.sqlite3"),
+        "REASONING_PROMPTS_PATH": os.path.join(work_dir, "reasoning_prompts.sqlite3"),
+    }
+    # Fresh reasoning cache per run, so the matches do the same work
+    if os.path.exists(env["REASONING_CACHE_PATH"]):
+        os.remove(env["REASONING_CACHE_PATH"])
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child", "--dim", str(dim)],
+        cwd=work_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup run failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _summarize(scenario: str, runs: List[Dict]) -> Dict:
+    row = {"scenario": scenario, "runs": len(runs)}
+    for key in ("import_s", "ready_s", "warm_up_s", "first_match_s", "second_match_s"):
+        values = [run[key] for run in runs if run[key] is not None]
+        row[key] = round(statistics.median(values), 4) if values else None
+    row["index_loaded_at_startup"] = runs[-1]["index_loaded_at_startup"]
+    row["documents_embedded"] = runs[-1]["documents_embedded"]
+    row["eager_modules"] = runs[-1]["eager_modules"]
+    print(json.dumps(row), flush=True)
+    return row
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=1000, help="synthetic catalog size")
+    parser.add_argument("--runs", type=int, default=3, help="runs per scenario")
+    parser.add_argument("--dim", type=int, default=768, help="stand-in embedding dimension")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args.dim)))
+        return
+
+    from benchmarks.synthetic import generate_jobs
+
+    work_dir = tempfile.mkdtemp(prefix="startup-bench-")
+    with open(os.path.join(work_dir, "jobs.json"), "w") as f:
+        json.dump({"jobs": generate_jobs(args.jobs, seed=args.seed)}, f)
+
+    cold = [
+        _run_child(work_dir, tempfile.mkdtemp(dir=work_dir), args.dim)
+        for _ in range(args.runs)
+    ]
+    # Populate one index directory, then time runs that start from it
+    warm_index_dir = tempfile.mkdtemp(dir=work_dir)
+    _run_child(work_dir, warm_index_dir, args.dim)
+    warm = [_run_child(work_dir, warm_index_dir, args.dim) for _ in range(args.runs)]
+
+    results = [_summarize("cold", cold), _summarize("warm", warm)]
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "commit": _commit(),
+                    "python": platform.python_version(),
+                    "params": vars(args),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Synthetic job catalogs and student artifact packs for benchmarks.
+
+Postings are recombined from the vocabulary of a seed catalog (jobs.json by
+default), so field distributions resemble the real data at any size.
+
+    python -m benchmarks.synthetic --n 100000 --output jobs_100k.json
+"""
+
+import argparse
+import json
+import random
+from typing import Dict, List, Optional
+
+from catalog import DEFAULT_JOBS_FILE, load_jobs_from_file
+from models import ArtifactPack
+
+_LOCATIONS = [
+    "Remote",
+    "Bengaluru, India",
+    "Hyderabad, India",
+    "Pune, India",
+    "New York, USA",
+    "San Francisco, USA",
+    "London, UK",
+    "Berlin, Germany",
+]
+
+
+def generate_jobs(
+    n: int, seed: int = 0, seed_jobs: Optional[List[Dict]] = None
+) -> List[Dict]:
+    """`n` postings shaped like jobs.json entries, deterministic per seed"""
+    rng = random.Random(seed)
+    seed_jobs = seed_jobs or load_jobs_from_file(DEFAULT_JOBS_FILE)
+    requirements = sorted({req for job in seed_jobs for req in job.get("requirements", [])})
+    companies = sorted({job["company"] for job in seed_jobs})
+    locations = sorted({job["location"] for job in seed_jobs} | set(_LOCATIONS))
+
+    jobs = []
+    for i in range(n):
+        template = rng.choice(seed_jobs)
+        job_id = f"job_{i + 1:06d}"
+        # Keep most of the template's requirements, mix in a few others
+        job_requirements = list(template.get("requirements", []))
+        rng.shuffle(job_requirements)
+        job_requirements = job_requirements[: rng.randint(2, max(2, len(job_requirements)))]
+        job_requirements += rng.sample(requirements, k=rng.randint(0, 2))
+
+        jobs.append(
+            {
+                **template,
+                "job_id": job_id,
+                "company": rng.choice(companies),
+                "location": rng.choice(locations),
+                "requirements": list(dict.fromkeys(job_requirements)),
+                "automation_allowed": rng.random() < 0.9,
+                "url": f"https://sandbox.api/jobs/{job_id}",
+            }
+        )
+    return jobs
+
+
+def generate_artifact_pack(
+    seed: int = 0, seed_jobs: Optional[List[Dict]] = None
+) -> ArtifactPack:
+    """A student whose skills and bullets overlap the catalog vocabulary"""
+    rng = random.Random(seed)
+    seed_jobs = seed_jobs or load_jobs_from_file(DEFAULT_JOBS_FILE)
+    requirements = sorted({req for job in seed_jobs for req in job.get("requirements", [])})
+    skills = rng.sample(requirements, k=min(8, len(requirements)))
+
+    projects = [
+        {
+            "name": f"Project {i + 1}",
+            "description": f"Built a tool using {', '.join(rng.sample(skills, k=2))}",
+            "tech": rng.sample(skills, k=3),
+        }
+        for i in range(3)
+    ]
+    bullets = [
+        {
+            "bullet": f"Built {rng.choice(['a service', 'a dashboard', 'a pipeline', 'an app'])} "
+            f"with {' and '.join(rng.sample(skills, k=2))}",
+            "source_type": "project",
+            "source_name": rng.choice(projects)["name"],
+        }
+        for _ in range(10)
+    ]
+
+    return ArtifactPack(
+        profile={
+            "education": ["B.Tech Computer Science"],
+            "skills": skills,
+            "projects": projects,
+            "internships": [
+                {
+                    "role": "Software Intern",
+                    "company": "Example Corp",
+                    "description": f"Worked with {', '.join(rng.sample(skills, k=3))}",
+                }
+            ],
+        },
+        bullet_bank=bullets,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=1000, help="number of postings")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True, help="jobs.json path to write")
+    args = parser.parse_args()
+
+    with open(args.output, "w") as f:
+        json.dump({"jobs": generate_jobs(args.n, args.seed)}, f)
+    print(f"Wrote {args.n} jobs to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class JSONFileCache:
+    """
+    JSON values on disk, one file per key.
+
+    Writes go to a temp file in the same directory and are renamed into
+    place, so concurrent readers (including other workers) never see a
+    partial file.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            with open(self._path(key), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class LRUTTLCache:
+    """
+    In-process cache bounded by entry count (least recently used evicted
+    first) and age (entries older than `ttl` seconds are treated as misses).
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] >= self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class SQLiteCache:
+    """
+    String values in a SQLite file, bounded to `max_entries` (least recently
+    used dropped first). WAL mode lets several worker processes share one
+    file, and entries survive restarts.
+
+    Reads only write when an entry's last use is older than TOUCH_INTERVAL,
+    and the table is trimmed once it is TRIM_SLACK over the bound, so the
+    common hit is a plain SELECT and an insert does not scan the table.
+    """
+
+    TOUCH_INTERVAL = 60.0
+    TRIM_SLACK = 0.1
+    # Keys per SELECT ... IN (...) (SQLite's default variable limit is 999)
+    _QUERY_KEYS = 500
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._trim_at = max_entries + max(1, int(max_entries * self.TRIM_SLACK))
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: no fsync per commit, still consistent after a crash
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS entries_used_at ON entries (used_at)"
+        )
+        self._db.commit()
+        # Rows as of the last count plus this process's inserts since; other
+        # workers' inserts are picked up when a trim recounts
+        self._count = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Values of the keys present, in one transaction"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        now = time.time()
+        stale = []
+        with self._lock:
+            for start in range(0, len(keys), self._QUERY_KEYS):
+                chunk = keys[start : start + self._QUERY_KEYS]
+                rows = self._db.execute(
+                    "SELECT key, value, used_at FROM entries WHERE key IN "
+                    f"({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, value, used_at in rows:
+                    found[key] = value
+                    if now - used_at >= self.TOUCH_INTERVAL:
+                        stale.append((now, key))
+            if stale:
+                self._db.executemany(
+                    "UPDATE entries SET used_at = ? WHERE key = ?", stale
+                )
+                self._db.commit()
+        return found
+
+    def set(self, key: str, value: str) -> None:
+        self.set_many([(key, value)])
+
+    def set_many(self, items: Iterable[Tuple[str, str]]) -> None:
+        now = time.time()
+        rows = [(key, value, now) for key, value in items]
+        if not rows:
+            return
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, used_at) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._count += len(rows)
+            if self._count > self._trim_at:
+                self._trim()
+            self._db.commit()
+
+    def _trim(self) -> None:
+        self._count = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if self._count > self.max_entries:
+            self._db.execute(
+                "DELETE FROM entries WHERE key IN ("
+                "SELECT key FROM entries ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._count = self.max_entries
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            deleted = self._db.execute("DELETE FROM entries WHERE key = ?", (key,)).rowcount
+            self._count -= deleted
+            self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+            self._count = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
@@ -0,0 +1,635 @@
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from collections.abc import Sequence
+from itertools import chain, islice
+from typing import Callable, Dict, Generator, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from skills import SkillMatrix
+
+DEFAULT_JOBS_FILE = "jobs.json"
+
+# Fields every job record needs; records without them are skipped on load
+REQUIRED_JOB_FIELDS = ("job_id", "title", "company")
+
+# Characters read at a time when streaming a jobs file
+_READ_CHUNK = 1 << 16
+_JOBS_ARRAY_START = re.compile(r'\s*\{\s*"jobs"\s*:\s*\[')
+# Always read one job per line, whatever the first line looks like
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+
+
+def parse_jobs(jobs_data) -> List[Dict]:
+    """Accept either a list of jobs or {"jobs": [...]}"""
+    if isinstance(jobs_data, dict) and isinstance(jobs_data.get("jobs"), list):
+        return jobs_data["jobs"]
+    elif isinstance(jobs_data, list):
+        return jobs_data
+    else:
+        raise ValueError("Invalid jobs.json format")
+
+
+def load_jobs_from_file(jobs_file_path: str = DEFAULT_JOBS_FILE) -> List[Dict]:
+    """Load the valid jobs from a JSON or JSONL jobs file"""
+    return list(iter_jobs_from_file(jobs_file_path))
+
+
+class IngestStats:
+    """Outcome of reading a jobs file: loaded jobs and skipped records by reason"""
+
+    MAX_EXAMPLES = 10
+
+    def __init__(self):
+        self.loaded = 0
+        self.skipped: Dict[str, int] = {}
+        self.examples: List[str] = []
+
+    def skip(self, record: int, reason: str) -> None:
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+        if len(self.examples) < self.MAX_EXAMPLES:
+            self.examples.append(f"record {record}: {reason}")
+
+    @property
+    def skipped_total(self) -> int:
+        return sum(self.skipped.values())
+
+    def as_dict(self) -> Dict:
+        return {
+            "loaded": self.loaded,
+            "skipped": self.skipped_total,
+            "skipped_by_reason": dict(self.skipped),
+            "examples": list(self.examples),
+        }
+
+
+class _BadRecord:
+    def __init__(self, reason: str):
+        self.reason = reason
+
+
+def validate_job(job) -> Optional[str]:
+    """Why a record can't be used as a job, or None if it can"""
+    if not isinstance(job, dict):
+        return "not an object"
+    for field in REQUIRED_JOB_FIELDS:
+        value = job.get(field)
+        if not isinstance(value, str) or not value.strip():
+            return f"missing {field}"
+    return None
+
+
+def iter_jobs_from_file(
+    jobs_file_path: str = DEFAULT_JOBS_FILE, stats: Optional[IngestStats] = None
+) -> Iterator[Dict]:
+    """
+    Yield the valid jobs of a jobs file one at a time, reading it in chunks.
+
+    Accepts a JSON array, {"jobs": [...]} or JSONL (one job per line;
+    always for JSONL_EXTENSIONS, else when the first line is a job
+    record). Records failing validate_job or repeating a job_id are
+    skipped and counted in `stats`, as are unparseable JSONL lines; a
+    syntax error inside a JSON array ends the load with ValueError since
+    the array cannot be resynchronized.
+    """
+    stats = stats if stats is not None else IngestStats()
+    seen = set()
+    with open(jobs_file_path, "r", encoding="utf-8") as f:
+        if jobs_file_path.lower().endswith(JSONL_EXTENSIONS):
+            records = _iter_lines(f)
+        else:
+            records = _iter_records(f)
+        for number, record in enumerate(records, 1):
+            if isinstance(record, _BadRecord):
+                reason = record.reason
+            else:
+                reason = validate_job(record)
+                if reason is None and record["job_id"] in seen:
+                    reason = "duplicate job_id"
+            if reason is not None:
+                stats.skip(number, reason)
+                continue
+            seen.add(record["job_id"])
+            stats.loaded += 1
+            yield record
+
+
+def _iter_records(f) -> Iterator:
+    buffer = f.read(_READ_CHUNK)
+    first = buffer.lstrip()[:1]
+    if first == "[":
+        rest = yield from _iter_array(f, buffer, buffer.index("[") + 1)
+        # Anything after the array: line-delimited records whose first line
+        # happened to be an array; read them on instead of dropping them
+        if rest.strip() and not rest.endswith("\n"):
+            rest += f.readline()
+        yield from _iter_lines(chain(io.StringIO(rest), f))
+        return
+    if first == "{":
+        match = _JOBS_ARRAY_START.match(buffer)
+        if match:
+            yield from _iter_array(f, buffer, match.end())
+            return
+        f.seek(0)
+        if _is_jsonl(f):
+            f.seek(0)
+            yield from _iter_lines(f)
+            return
+        # A pretty-printed object with "jobs" after other keys: no streaming
+        f.seek(0)
+        yield from parse_jobs(json.load(f))
+        return
+    raise ValueError("Invalid jobs.json format")
+
+
+def _is_jsonl(f) -> bool:
+    """
+    Whether a file starting with "{" holds one job per line, judged by whole
+    lines: the first (non-empty) line is a job record, or it is malformed
+    and the next one is (a bad first record)
+    """
+    lines = (line for line in f if line.strip())
+    for line in islice(lines, 2):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        return isinstance(record, dict) and any(
+            field in record for field in REQUIRED_JOB_FIELDS
+        )
+    return False
+
+
+def _iter_array(f, buffer: str, pos: int) -> Generator:
+    """
+    Elements of the JSON array whose "[" ends just before `pos`; returns
+    what was read past its "]"
+    """
+    decoder = json.JSONDecoder()
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == "]":
+            return buffer[pos + 1 :]
+
+        try:
+            if pos == len(buffer):
+                raise json.JSONDecodeError("end of buffer", buffer, pos)
+            record, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Element cut off at the end of the buffer: read on and retry
+            more = f.read(_READ_CHUNK)
+            if not more:
+                raise ValueError("Invalid jobs.json format: malformed or unterminated array")
+            buffer, pos = buffer[pos:] + more, 0
+            continue
+
+        yield record
+        pos = end
+        if pos > _READ_CHUNK:
+            buffer, pos = buffer[pos:], 0
+
+
+def _iter_lines(f) -> Iterator:
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield _BadRecord("invalid JSON")
+
+
+def _file_version(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def filter_automatable_jobs(jobs: List[Dict]) -> List[Dict]:
+    """Filter jobs where automation_allowed = true"""
+    return [job for job in jobs if job.get("automation_allowed", True)]
+
+
+# Placeholders in JobTable columns: field absent from the row / the row's
+# requirements live in the requirement CSR
+_MISSING = object()
+_REQUIREMENTS = object()
+
+
+class JobTable(Sequence):
+    """
+    Jobs stored column-wise instead of one dict per posting.
+
+    Strings are interned, low-cardinality fields are stored as integer codes
+    into a list of distinct values, and requirements are a CSR array of
+    requirement IDs. Indexing materializes a fresh job dict for that row.
+    """
+
+    def __init__(self, jobs: Iterable[Dict]):
+        strings: Dict[str, str] = {}
+        columns: Dict[str, List] = {}
+        requirement_ids: Dict[str, int] = {}
+        self.requirements: List[str] = []
+        indptr = [0]
+        indices: List[int] = []
+        size = 0
+
+        for job in jobs:
+            for field, value in job.items():
+                column = columns.get(field)
+                if column is None:
+                    column = columns[field] = [_MISSING] * size
+                if field == "requirements" and isinstance(value, list):
+                    for requirement in value:
+                        requirement_id = requirement_ids.get(requirement)
+                        if requirement_id is None:
+                            requirement_id = requirement_ids[requirement] = len(
+                                self.requirements
+                            )
+                            self.requirements.append(requirement)
+                        indices.append(requirement_id)
+                    value = _REQUIREMENTS
+                elif isinstance(value, str):
+                    value = strings.setdefault(value, value)
+                column.append(value)
+            size += 1
+            indptr.append(len(indices))
+            for column in columns.values():
+                if len(column) < size:
+                    column.append(_MISSING)
+
+        self.size = size
+        self.fields = list(columns)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self._columns = {field: _compact(column) for field, column in columns.items()}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(self.size))]
+        if row < 0:
+            row += self.size
+        if not 0 <= row < self.size:
+            raise IndexError("job row out of range")
+
+        job = {}
+        for field in self.fields:
+            value = self._value(field, row)
+            if value is _MISSING:
+                continue
+            if value is _REQUIREMENTS:
+                value = self.requirements_of(row)
+            job[field] = value
+        return job
+
+    def _value(self, field: str, row: int):
+        column = self._columns[field]
+        if isinstance(column, tuple):
+            codes, values = column
+            return values[codes[row]]
+        return column[row]
+
+    def requirements_of(self, row: int) -> List[str]:
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return [self.requirements[i] for i in self.indices[start:end]]
+
+    def requirement_rows(self) -> Iterator[List[str]]:
+        """Each row's requirements, without materializing the jobs"""
+        for row in range(self.size):
+            yield self.requirements_of(row)
+
+    def column(self, field: str, default=None) -> Iterator:
+        """Each row's value of one field (`default` where it is absent)"""
+        column = self._columns.get(field)
+        if column is None:
+            return iter([default] * self.size)
+        if isinstance(column, tuple):
+            codes, values = column
+            values = [default if value is _MISSING else value for value in values]
+            return (values[code] for code in codes.tolist())
+        return (default if value is _MISSING else value for value in column)
+
+    def take(self, rows) -> "JobRows":
+        return JobRows(self, rows)
+
+
+class JobRows(Sequence):
+    """A subset of a JobTable's rows, materialized on access like the table"""
+
+    def __init__(self, table: JobTable, rows):
+        self.table = table
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return self.table[int(self.rows[i])]
+
+
+def _compact(column: List):
+    """
+    (codes, values) for columns with few distinct values, else the list.
+    Values are keyed by type too, so True and 1 stay distinct.
+    """
+    values: Dict[Tuple, int] = {}
+    try:
+        codes = [values.setdefault((type(value), value), len(values)) for value in column]
+    except TypeError:
+        # Unhashable values (nested objects): keep the plain list
+        return column
+    if len(values) > max(1, len(column) // 2):
+        return column
+    dtype = np.min_scalar_type(max(len(values) - 1, 0))
+    return np.asarray(codes, dtype=dtype), [value for _, value in values]
+
+
+class FieldBitmaps:
+    """
+    Per-field value codes and packed per-value bitmaps (one bit per catalog
+    row) for the filterable job fields, so filters combine with bitwise ops
+    and facet counts are one bincount instead of row scans.
+    """
+
+    FIELDS = (
+        "category",
+        "experience_level",
+        "employment_type",
+        "location",
+        "application_flow",
+    )
+
+    def __init__(self, jobs: JobTable):
+        self.size = len(jobs)
+        self.codes: Dict[str, np.ndarray] = {}
+        self.values: Dict[str, List[str]] = {}
+        # Facets show a value as first spelled in the file
+        self.labels: Dict[str, Dict[str, str]] = {}
+        self.bitmaps: Dict[str, Dict[str, np.ndarray]] = {}
+        for field in self.FIELDS:
+            code_of: Dict[str, int] = {}
+            labels: Dict[str, str] = {}
+            codes = np.empty(self.size, dtype=np.int32)
+            for row, value in enumerate(jobs.column(field)):
+                key = _normalize_value(value)
+                code = code_of.get(key)
+                if code is None:
+                    code = code_of[key] = len(code_of)
+                    labels[key] = str(value) if value is not None else ""
+                codes[row] = code
+
+            self.codes[field] = codes
+            self.values[field] = list(code_of)
+            self.labels[field] = labels
+            # Rows grouped by value code, for one bitmap per value
+            groups = np.split(
+                np.argsort(codes, kind="stable"),
+                np.cumsum(np.bincount(codes, minlength=len(code_of)))[:-1],
+            )
+            self.bitmaps[field] = {
+                value: self._pack(rows) for value, rows in zip(code_of, groups)
+            }
+        self.all = self._pack(range(self.size))
+
+    def _pack(self, rows) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        mask[np.asarray(rows, dtype=np.int64)] = True
+        return np.packbits(mask)
+
+    def _empty(self) -> np.ndarray:
+        return np.zeros_like(self.all)
+
+    def _field(self, field: str, value: str) -> np.ndarray:
+        return self.bitmaps[field].get(_normalize_value(value), self._empty())
+
+    def _location_contains(self, text: str) -> np.ndarray:
+        text = _normalize_value(text)
+        bitmap = self._empty()
+        for value, value_bitmap in self.bitmaps["location"].items():
+            if text in value:
+                bitmap |= value_bitmap
+        return bitmap
+
+    def mask(self, filters) -> Optional[np.ndarray]:
+        """
+        Boolean row mask for a JobFilters, or None when nothing is filtered
+        """
+        if filters is None or filters.is_empty():
+            return None
+
+        bitmap = self.all.copy()
+        for field in ("category", "experience_level", "employment_type"):
+            value = getattr(filters, field)
+            if value is not None:
+                bitmap &= self._field(field, value)
+        if filters.location is not None:
+            bitmap &= self._location_contains(filters.location)
+        if filters.remote is not None:
+            remote = self._field("location", "remote")
+            bitmap &= remote if filters.remote else ~remote
+
+        return np.unpackbits(bitmap, count=self.size).astype(bool)
+
+    def counts(self, field: str, mask: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """Jobs per normalized value of `field`, over the rows in `mask` (or all)"""
+        codes = self.codes[field] if mask is None else self.codes[field][mask]
+        counts = np.bincount(codes, minlength=len(self.values[field]))
+        return {
+            value: int(count)
+            for value, count in zip(self.values[field], counts.tolist())
+            if count and value
+        }
+
+    def label(self, field: str, value: str) -> str:
+        return self.labels[field].get(value, value)
+
+
+def _normalize_value(value) -> str:
+    return str(value if value is not None else "").lower().strip()
+
+
+# Fields /jobs/facets can group by; requirements counts each listed skill
+FACET_FIELDS = FieldBitmaps.FIELDS + ("requirements",)
+
+
+class CatalogSnapshot:
+    """
+    One immutable version of a jobs file.
+
+    Requests should take a snapshot once and read everything from it, so a
+    reload in the middle of a request cannot mix two versions.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        jobs: Iterable[Dict],
+        version: str,
+        stat_key: Tuple,
+        ingest: Optional[IngestStats] = None,
+    ):
+        self.path = path
+        self.jobs = JobTable(jobs)
+        self.ingest = ingest or IngestStats()
+        self.version = version
+        self.stat_key = stat_key
+        self.row_by_id = {job_id: row for row, job_id in enumerate(self.jobs.column("job_id"))}
+        self.automatable_mask = np.fromiter(
+            (bool(value) for value in self.jobs.column("automation_allowed", True)),
+            dtype=bool,
+            count=len(self.jobs),
+        )
+        self.automatable_rows = np.flatnonzero(self.automatable_mask)
+        self.automatable_jobs = self.jobs.take(self.automatable_rows)
+        self.skills = SkillMatrix.from_requirements(self.jobs.requirement_rows())
+        self.filters = FieldBitmaps(self.jobs)
+        # Unfiltered facets of the automatable jobs, and /jobs/stats from them
+        self.facets = {
+            field: self._count(field, self.automatable_mask) for field in FACET_FIELDS
+        }
+        self.stats = self._stats()
+        self._derived: Dict[str, object] = {}
+        self._derived_lock = threading.Lock()
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        row = self.row_by_id.get(job_id)
+        return self.jobs[row] if row is not None else None
+
+    def _count(self, field: str, mask: np.ndarray) -> Dict[str, int]:
+        """Jobs per (normalized) value of a facet field among the rows in `mask`"""
+        if field != "requirements":
+            return self.filters.counts(field, mask)
+        # Requirement IDs of the masked rows, straight from the CSR array
+        lengths = np.diff(self.jobs.indptr)
+        counts = np.bincount(
+            self.jobs.indices[np.repeat(mask, lengths)],
+            minlength=len(self.jobs.requirements),
+        )
+        return {
+            self.jobs.requirements[i]: int(counts[i]) for i in np.flatnonzero(counts)
+        }
+
+    def _stats(self) -> Dict[str, int]:
+        category = self.facets["category"]
+        experience_level = self.facets["experience_level"]
+        automatable = len(self.automatable_rows)
+        return {
+            "total_jobs": len(self.jobs),
+            "automatable_jobs": automatable,
+            "non_automatable_jobs": len(self.jobs) - automatable,
+            "tech_jobs": category.get("tech", 0),
+            "non_tech_jobs": category.get("non-tech", 0),
+            "intern_positions": experience_level.get("intern", 0),
+            "entry_positions": experience_level.get("entry", 0),
+            "remote_jobs": self.facets["location"].get("remote", 0),
+            "skipped_records": self.ingest.skipped_total,
+        }
+
+    def facet_counts(
+        self, fields: Iterable[str], filters=None, automatable_only: bool = True
+    ) -> Tuple[int, Dict[str, List[Tuple[str, int]]]]:
+        """
+        (matching jobs, {field: [(value, count), ...]}) for the jobs passing
+        a JobFilters, values sorted by count. Unfiltered automatable counts
+        come from the ones computed at load.
+        """
+        mask = self.filters.mask(filters)
+        if mask is None and automatable_only:
+            total, counts = len(self.automatable_rows), self.facets
+        else:
+            if mask is None:
+                mask = np.ones(len(self.jobs), dtype=bool)
+            if automatable_only:
+                mask &= self.automatable_mask
+            total = int(mask.sum())
+            counts = {field: self._count(field, mask) for field in fields}
+
+        facets = {}
+        for field in fields:
+            ranked = sorted(
+                counts[field].items(), key=lambda item: (-item[1], item[0])
+            )
+            if field == "requirements":
+                facets[field] = ranked
+            else:
+                facets[field] = [
+                    (self.filters.label(field, value), count) for value, count in ranked
+                ]
+        return total, facets
+
+    def derived(self, key: str, build: Callable[[], object]):
+        """Compute a value from this snapshot once and reuse it until reload"""
+        if key not in self._derived:
+            with self._derived_lock:
+                if key not in self._derived:
+                    self._derived[key] = build()
+        return self._derived[key]
+
+
+class JobCatalog:
+    """Process-wide jobs file, reloaded when its mtime or content changes"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Current snapshot, reloading the file first if it changed on disk"""
+        stat = os.stat(self.path)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+
+        current = self._snapshot
+        if current is not None and current.stat_key == stat_key:
+            return current
+
+        with self._lock:
+            current = self._snapshot
+            if current is not None and current.stat_key == stat_key:
+                return current
+
+            version = _file_version(self.path)
+
+            # Touched but unchanged: keep the parsed data
+            if current is not None and current.version == version:
+                current.stat_key = stat_key
+                return current
+
+            # Stream the file straight into the columnar table
+            stats = IngestStats()
+            snapshot = CatalogSnapshot(
+                self.path, iter_jobs_from_file(self.path, stats), version, stat_key, stats
+            )
+            print(f"Loaded {stats.loaded} jobs from {self.path} (version {version})")
+            if stats.skipped:
+                print(f"Skipped {stats.skipped_total} invalid job records: {stats.skipped}")
+
+            # Swap in the new version; in-flight requests keep the old one
+            self._snapshot = snapshot
+            return snapshot
+
+
+_catalogs: Dict[str, JobCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(jobs_file_path: str = DEFAULT_JOBS_FILE) -> JobCatalog:
+    """Shared catalog for a jobs file path"""
+    key = os.path.abspath(jobs_file_path)
+    with _catalogs_lock:
+        if key not in _catalogs:
+            _catalogs[key] = JobCatalog(jobs_file_path)
+        return _catalogs[key]
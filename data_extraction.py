@@ -1,29 +1,206 @@
-import pdfplumber
-import requests
-from bs4 import BeautifulSoup
+import httpx
 from urllib.parse import urljoin, urlparse
-from typing import Dict, List, Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
 from prompts import system_prompt_data_extraction
 from models import ArtifactPack
+from github_client import GitHubClient
+from cache import SQLiteCache
+from metrics import external_call, stage_timer
 from dotenv import load_dotenv
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import hashlib
+import io
+import json
+import multiprocessing
 import os
+import signal
+import threading
+import time
 load_dotenv()   
 
-def extract_resume_text(pdf_path: str) -> str:
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "20"))
+PDF_TIMEOUT = float(os.getenv("PDF_TIMEOUT", "30"))
+GITHUB_TIMEOUT = float(os.getenv("GITHUB_TIMEOUT", "10"))
+SCRAPE_TIMEOUT = float(os.getenv("SCRAPE_TIMEOUT", "10"))
+HTTP_TIMEOUT = 10.0
+USER_AGENT = "Mozilla/5.0 (compatible; ResumeAnalyzerBot/1.0)"
+ANALYSIS_MODEL = "gemini-2.0-flash-lite"
+ANALYSIS_CACHE_PATH = os.getenv("ANALYSIS_CACHE_PATH", ".cache/analyze.sqlite3")
+# Stored artifact packs, least recently used dropped first
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "10000"))
+# GitHub / portfolio content can change under the same identifiers
+ANALYSIS_CACHE_TTL = float(os.getenv("ANALYSIS_CACHE_TTL", "86400"))
+# Changes whenever the extraction prompt is edited
+ANALYSIS_PROMPT_VERSION = hashlib.sha256(
+    system_prompt_data_extraction.encode("utf-8")
+).hexdigest()[:16]
+
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+# Pids reported by each PDF pool's workers as they start, so a stuck parse
+# can be killed through its pool
+_pdf_worker_pids: Dict[ProcessPoolExecutor, Any] = {}
+_http_client: Optional[httpx.AsyncClient] = None
+_github_client: Optional[GitHubClient] = None
+_analysis_cache: Optional[SQLiteCache] = None
+_analysis_cache_lock = threading.Lock()
+
+
+def _extract_pdf_text(pdf, max_pages: Optional[int]) -> str:
     text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
+    for page in pdf.pages[:max_pages]:
+        page_text = page.extract_text()
+        if page_text:
+            text += page_text + "\n"
     return text
 
 
+def extract_resume_text(pdf_path: str, max_pages: Optional[int] = None) -> str:
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return _extract_pdf_text(pdf, max_pages)
+
+
+def extract_resume_text_from_bytes(
+    pdf_bytes: bytes, max_pages: Optional[int] = PDF_MAX_PAGES
+) -> str:
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        return _extract_pdf_text(pdf, max_pages)
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """
+    Shared process pool for PDF parsing (created on first use, and again
+    after a crashed or stuck parse discarded it)
+    """
+    global _pdf_pool
+    if _pdf_pool is None:
+        context = multiprocessing.get_context("spawn")
+        pids = context.SimpleQueue()
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=PDF_WORKERS,
+            mp_context=context,
+            initializer=_report_pid,
+            initargs=(pids,),
+        )
+        _pdf_worker_pids[_pdf_pool] = pids
+    return _pdf_pool
+
+
+def _report_pid(pids) -> None:
+    pids.put(os.getpid())
+
+
+def _discard_pdf_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Kill a pool's workers (a stuck or crashed parse) and drop it; parses
+    still running in it fail with BrokenProcessPool and are retried
+    """
+    global _pdf_pool
+    if _pdf_pool is pool:
+        _pdf_pool = None
+    pids = _pdf_worker_pids.pop(pool, None)
+    while pids is not None and not pids.empty():
+        try:
+            os.kill(pids.get(), getattr(signal, "SIGKILL", signal.SIGTERM))
+        except OSError:
+            pass
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pdf_pool() -> None:
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_worker_pids.pop(_pdf_pool, None)
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+async def extract_resume_text_async(
+    pdf_bytes: bytes,
+    timeout: float = PDF_TIMEOUT,
+    max_pages: Optional[int] = PDF_MAX_PAGES,
+) -> str:
+    """
+    Parse an in-memory PDF in the process pool without blocking the event loop.
+
+    A parse abandoned while still running (timeout or cancelled request)
+    has its worker killed, so slow PDFs cannot hold the pool. A parse whose
+    worker died is retried once on a fresh pool, within the same timeout.
+    """
+    deadline = time.monotonic() + timeout
+    with stage_timer("pdf_extract"):
+        for attempt in range(2):
+            pool = get_pdf_pool()
+            try:
+                task = pool.submit(extract_resume_text_from_bytes, pdf_bytes, max_pages)
+                return await asyncio.wait_for(
+                    asyncio.wrap_future(task), max(deadline - time.monotonic(), 0)
+                )
+            except BrokenProcessPool:
+                _discard_pdf_pool(pool)
+                if attempt:
+                    raise
+                print("PDF worker died, retrying on a fresh pool")
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                if not task.done():
+                    _discard_pdf_pool(pool)
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+                raise TimeoutError(f"PDF extraction timed out after {timeout}s")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared async HTTP client (keep-alive connection pool), created on first use"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            headers={"User-Agent": USER_AGENT},
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 def fetch_github(username: str) -> Dict:
-    profile = requests.get(f"https://api.github.com/users/{username}").json()
-    repos = requests.get(f"https://api.github.com/users/{username}/repos").json()
+    import requests
+
+    with external_call("github", count=2):
+        profile = requests.get(f"https://api.github.com/users/{username}").json()
+        repos = requests.get(f"https://api.github.com/users/{username}/repos").json()
 
+    return _clean_github(profile, repos)
+
+
+def get_github_client() -> GitHubClient:
+    """Shared cached GitHub client on top of the pooled HTTP client"""
+    global _github_client
+    if _github_client is None or _github_client.client is not get_http_client():
+        _github_client = GitHubClient(get_http_client())
+    return _github_client
+
+
+async def fetch_github_async(username: str) -> Dict:
+    with stage_timer("github_fetch"):
+        profile, repos = await get_github_client().fetch_user(username)
+
+    return _clean_github(profile, repos)
+
+
+def _clean_github(profile: Dict, repos: List[Dict]) -> Dict:
     clean_repos = []
     for r in repos:
         clean_repos.append(
@@ -107,14 +284,36 @@ def classify_links(links: List[Dict]) -> Dict[str, List]:
 
 
 def scrape_page(url: str) -> Dict:
-    r = requests.get(
-        url,
-        timeout=10,
-        headers={"User-Agent": "Mozilla/5.0 (compatible; ResumeAnalyzerBot/1.0)"},
-    )
-    r.raise_for_status()
+    import requests
+
+    with external_call("scrape"):
+        r = requests.get(
+            url,
+            timeout=10,
+            headers={"User-Agent": USER_AGENT},
+        )
+        r.raise_for_status()
 
-    soup = BeautifulSoup(r.text, "html.parser")
+    return parse_page(url, r.text)
+
+
+async def scrape_page_async(
+    url: str, client: Optional[httpx.AsyncClient] = None
+) -> Dict:
+    client = client or get_http_client()
+    with stage_timer("portfolio_scrape"):
+        with external_call("scrape"):
+            r = await client.get(url)
+            r.raise_for_status()
+
+        # HTML parsing is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(parse_page, url, r.text)
+
+
+def parse_page(url: str, html: str) -> Dict:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
 
     # Remove junk
     for tag in soup(["script", "style", "noscript"]):
@@ -144,6 +343,42 @@ def scrape_page(url: str) -> Dict:
     return {"url": url, "text": text[:8000], "links": unique_links}  # Limit text length
 
 
+async def fetch_sources(
+    sources: Dict[str, Tuple[Awaitable, float]]
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Run ingestion sources concurrently, each under its own timeout.
+
+    Args:
+        sources: name -> (awaitable, timeout in seconds)
+
+    Returns:
+        (results, errors): a failed or timed-out source is left out of
+        results and its error message recorded under the same name
+    """
+
+    async def run(name: str, awaitable: Awaitable, timeout: float):
+        try:
+            return name, await asyncio.wait_for(awaitable, timeout), None
+        except asyncio.TimeoutError:
+            return name, None, f"timed out after {timeout}s"
+        except Exception as e:
+            return name, None, str(e) or repr(e)
+
+    results, errors = {}, {}
+    outcomes = await asyncio.gather(
+        *(run(name, awaitable, timeout) for name, (awaitable, timeout) in sources.items())
+    )
+    for name, result, error in outcomes:
+        if error is None:
+            results[name] = result
+        else:
+            print(f"Error fetching {name}: {error}")
+            errors[name] = error
+
+    return results, errors
+
+
 def ingest_linkedin(text: str) -> str:
     return text.strip()
 
@@ -165,8 +400,10 @@ def build_data_pool(
 
 
 def analyze_resume_data(data_pool: Dict, api_key: str) -> ArtifactPack:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
     llm = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash-lite",
+        model=ANALYSIS_MODEL,
         temperature=0,
         google_api_key=api_key,  # Use passed key
     )
@@ -176,6 +413,81 @@ def analyze_resume_data(data_pool: Dict, api_key: str) -> ArtifactPack:
         ("user", f"Student Data to Process:\n\n{data_pool}"),
     ]
 
-    response = llm_structured.invoke(message)
+    with stage_timer("artifact_extraction"), external_call("llm"):
+        response = llm_structured.invoke(message)
 
     return response
+
+
+def _normalize_url(url: str) -> str:
+    parsed = urlparse(url.strip())
+    path = parsed.path.rstrip("/")
+    return parsed._replace(
+        scheme=parsed.scheme.lower(), netloc=parsed.netloc.lower(), path=path
+    ).geturl()
+
+
+def analysis_cache_key(
+    pdf_bytes: bytes,
+    github_username: Optional[str] = None,
+    portfolio_url: Optional[str] = None,
+    linkedin_text: Optional[str] = None,
+) -> str:
+    """
+    Content address of an /analyze request: the resume bytes, normalized
+    source identifiers and the extraction model / prompt version.
+    """
+    payload = {
+        "resume_sha256": hashlib.sha256(pdf_bytes).hexdigest(),
+        "github": github_username.strip().lower() if github_username else None,
+        "portfolio": _normalize_url(portfolio_url) if portfolio_url else None,
+        "linkedin_sha256": (
+            hashlib.sha256(linkedin_text.strip().encode("utf-8")).hexdigest()
+            if linkedin_text and linkedin_text.strip()
+            else None
+        ),
+        "model": ANALYSIS_MODEL,
+        "prompt_version": ANALYSIS_PROMPT_VERSION,
+    }
+    return json.dumps(payload, sort_keys=True)
+
+
+def get_analysis_cache() -> SQLiteCache:
+    """
+    Process-wide handle on the shared artifact pack cache (SQLite in WAL
+    mode, so uvicorn workers can read and write it concurrently)
+    """
+    global _analysis_cache
+    with _analysis_cache_lock:
+        if _analysis_cache is None:
+            _analysis_cache = SQLiteCache(ANALYSIS_CACHE_PATH, ANALYSIS_CACHE_SIZE)
+        return _analysis_cache
+
+
+def _analysis_entry_key(key: str) -> str:
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def get_cached_analysis(key: str) -> Optional[ArtifactPack]:
+    """
+    Stored ArtifactPack for a key, unless expired or no longer valid (then
+    the entry is deleted)
+    """
+    cache = get_analysis_cache()
+    entry_key = _analysis_entry_key(key)
+    value = cache.get(entry_key)
+    if value is None:
+        return None
+    try:
+        entry = json.loads(value)
+        if time.time() - entry["created_at"] < ANALYSIS_CACHE_TTL:
+            return ArtifactPack.model_validate(entry["artifact_pack"])
+    except (ValueError, KeyError, TypeError):
+        pass
+    cache.delete(entry_key)
+    return None
+
+
+def store_analysis(key: str, artifact_pack: ArtifactPack) -> None:
+    entry = {"created_at": time.time(), "artifact_pack": artifact_pack.model_dump(mode="json")}
+    get_analysis_cache().set(_analysis_entry_key(key), json.dumps(entry))
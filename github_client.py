@@ -0,0 +1,132 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from cache import JSONFileCache
+from metrics import external_call
+
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+GITHUB_CACHE_DIR = os.getenv("GITHUB_CACHE_DIR", ".cache/github")
+GITHUB_CACHE_TTL = float(os.getenv("GITHUB_CACHE_TTL", "3600"))
+GITHUB_MAX_PAGES = int(os.getenv("GITHUB_MAX_PAGES", "10"))
+GITHUB_PER_PAGE = 100
+
+# Entries also kept in process memory so repeat lookups skip disk entirely
+_MEMORY_ENTRIES = 1024
+
+
+class GitHubClient:
+    """
+    GitHub REST client with an on-disk response cache.
+
+    Fresh entries (younger than `ttl`) are served without a request. Stale
+    entries are revalidated with If-None-Match / If-Modified-Since, so an
+    unchanged resource costs a 304 that does not count against the rate
+    limit. If GitHub refuses (403/429) a stale entry is served instead.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        base_url: str = GITHUB_API_URL,
+        cache_dir: str = GITHUB_CACHE_DIR,
+        ttl: float = GITHUB_CACHE_TTL,
+        token: Optional[str] = GITHUB_TOKEN,
+        max_pages: int = GITHUB_MAX_PAGES,
+    ):
+        self.client = client
+        self.base_url = base_url.rstrip("/")
+        self.cache = JSONFileCache(cache_dir)
+        self.ttl = ttl
+        self.max_pages = max_pages
+        self.headers = {"Accept": "application/vnd.github+json"}
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+
+    def _remember(self, url: str, entry: Dict) -> None:
+        self._memory[url] = entry
+        self._memory.move_to_end(url)
+        while len(self._memory) > _MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    async def _get(self, path: str, params: Optional[Dict] = None) -> Dict:
+        """Cached GET; returns the cache entry ({"body", "last_page", ...})"""
+        url = str(httpx.URL(self.base_url + path, params=params or {}))
+
+        entry = self._memory.get(url)
+        if entry is None:
+            entry = await asyncio.to_thread(self.cache.get, url)
+        if entry is not None and time.time() - entry["fetched_at"] < self.ttl:
+            self._remember(url, entry)
+            return entry
+
+        headers = dict(self.headers)
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        with external_call("github"):
+            response = await self.client.get(url, headers=headers)
+
+        if entry is not None and response.status_code == 304:
+            entry = dict(entry, fetched_at=time.time())
+        elif entry is not None and response.status_code in (403, 429):
+            print(f"GitHub returned {response.status_code} for {url}, serving cached copy")
+            return entry
+        else:
+            response.raise_for_status()
+            entry = {
+                "body": response.json(),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "last_page": _last_page(response),
+                "fetched_at": time.time(),
+            }
+
+        await asyncio.to_thread(self.cache.set, url, entry)
+        self._remember(url, entry)
+        return entry
+
+    async def fetch_user(self, username: str) -> Tuple[Dict, List[Dict]]:
+        """
+        Profile and all public repos of a user; repo pages after the first
+        are fetched concurrently.
+        """
+        repos_path = f"/users/{username}/repos"
+        profile, first_page = await asyncio.gather(
+            self._get(f"/users/{username}"),
+            self._get(repos_path, {"per_page": GITHUB_PER_PAGE, "page": 1}),
+        )
+
+        last_page = min(first_page["last_page"], self.max_pages)
+        rest = await asyncio.gather(
+            *(
+                self._get(repos_path, {"per_page": GITHUB_PER_PAGE, "page": page})
+                for page in range(2, last_page + 1)
+            )
+        )
+
+        repos = list(first_page["body"])
+        for page in rest:
+            repos.extend(page["body"])
+
+        return profile["body"], repos
+
+
+def _last_page(response: httpx.Response) -> int:
+    """Page number of rel="last" in the Link header (1 if unpaginated)"""
+    last = response.links.get("last")
+    if not last:
+        return 1
+    try:
+        return int(httpx.URL(last["url"]).params.get("page", 1))
+    except ValueError:
+        return 1
@@ -0,0 +1,894 @@
+import hashlib
+import heapq
+import json
+import math
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+
+from metrics import external_call
+
+EMBEDDING_MODEL = "models/embedding-001"
+JOB_INDEX_DIR = os.getenv("JOB_INDEX_DIR", ".job_index")
+# On-disk dtype of the embedding matrix: float32, or float16 for half the
+# size (scored in float32 blocks)
+JOB_VECTOR_DTYPE = os.getenv("JOB_VECTOR_DTYPE", "float32")
+# Memory-map the saved vectors and FAISS index read-only, so every worker
+# on the host shares one page-cache copy instead of reading its own
+JOB_INDEX_MMAP = os.getenv("JOB_INDEX_MMAP", "true").lower() in ("1", "true", "yes")
+# Index shards (1 = one index). Jobs are partitioned by content hash and
+# every shard is persisted and rebuilt on its own
+JOB_INDEX_SHARDS = int(os.getenv("JOB_INDEX_SHARDS", "1"))
+# Processes searching the shards in parallel (0 = search them in-process)
+JOB_INDEX_SHARD_WORKERS = int(
+    os.getenv("JOB_INDEX_SHARD_WORKERS", str(min(JOB_INDEX_SHARDS, os.cpu_count() or 1)))
+)
+
+# Versions kept on disk besides the current one, so a worker can still open
+# the version it has just read while another rewrites, and catalogs sharing
+# the directory reuse each other's vectors instead of re-embedding them.
+_KEEP_VERSIONS = 2
+
+# Max (queries x jobs) score cells held at once by JobIndex.search_batch
+_SCORE_CHUNK_CELLS = 1 << 24
+# Rows of a float16 matrix converted to float32 at a time
+_CONVERT_ROWS = 1 << 16
+# Jobs per embedding request / rows per copy when writing a vector set, so
+# building an index never holds more than one batch outside the mapped file
+JOB_INDEX_BATCH_SIZE = int(os.getenv("JOB_INDEX_BATCH_SIZE", "1000"))
+
+# Guards the memo dicts and shard pool; builds take the lock of their model_dir,
+# so embedding one catalog never blocks memo hits or other catalogs
+_lock = threading.Lock()
+_build_locks: Dict[str, threading.Lock] = {}
+_loaded: Dict[str, "JobIndex"] = {}
+_loaded_sharded: Dict[str, "ShardedJobIndex"] = {}
+
+_shard_pool: Optional[ProcessPoolExecutor] = None
+# Shards opened by this process when it serves the shard pool
+_open_shards: Dict[str, "JobIndex"] = {}
+
+
+class IndexConfig:
+    """
+    FAISS index type and tuning knobs. All types score by inner product on
+    L2-normalized vectors, i.e. cosine similarity.
+
+    - flat: exact search (default)
+    - hnsw: graph index; `hnsw_m` and `ef_construction` at build time,
+      `ef_search` at query time (higher = better recall, slower)
+    - ivf: inverted lists; `nlist` clusters at build time (0 = 4*sqrt(n)),
+      `nprobe` clusters scanned at query time
+    """
+
+    TYPES = ("flat", "hnsw", "ivf")
+
+    def __init__(
+        self,
+        type: str = "flat",
+        hnsw_m: int = 32,
+        ef_construction: int = 80,
+        ef_search: int = 64,
+        nlist: int = 0,
+        nprobe: int = 16,
+    ):
+        if type not in self.TYPES:
+            raise ValueError(f"Unknown index type {type!r}, expected one of {self.TYPES}")
+        self.type = type
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.nlist = nlist
+        self.nprobe = nprobe
+
+    @classmethod
+    def from_env(cls) -> "IndexConfig":
+        return cls(
+            type=os.getenv("JOB_INDEX_TYPE", "flat"),
+            hnsw_m=int(os.getenv("JOB_INDEX_HNSW_M", "32")),
+            ef_construction=int(os.getenv("JOB_INDEX_EF_CONSTRUCTION", "80")),
+            ef_search=int(os.getenv("JOB_INDEX_EF_SEARCH", "64")),
+            nlist=int(os.getenv("JOB_INDEX_NLIST", "0")),
+            nprobe=int(os.getenv("JOB_INDEX_NPROBE", "16")),
+        )
+
+    def nlist_for(self, n: int) -> int:
+        nlist = self.nlist or int(4 * math.sqrt(n))
+        return max(1, min(nlist, n))
+
+    def spec(self, n: int) -> str:
+        """Build-time identity of the index (part of its file name)"""
+        if self.type == "hnsw":
+            return f"hnsw{self.hnsw_m}-ef{self.ef_construction}"
+        if self.type == "ivf":
+            return f"ivf{self.nlist_for(n)}"
+        return "flat"
+
+    def search_params(self, selector=None):
+        kwargs = {"sel": selector} if selector is not None else {}
+        if self.type == "hnsw":
+            return faiss.SearchParametersHNSW(efSearch=self.ef_search, **kwargs)
+        if self.type == "ivf":
+            return faiss.SearchParametersIVF(nprobe=self.nprobe, **kwargs)
+        return faiss.SearchParameters(**kwargs) if kwargs else None
+
+
+JOB_INDEX_CONFIG = IndexConfig.from_env()
+
+
+class JobIndex:
+    """
+    Job documents with their embedding matrix and FAISS index (row-aligned).
+
+    The flat type has no FAISS index: it scores the (possibly memory-mapped)
+    matrix directly.
+    """
+
+    def __init__(
+        self,
+        documents: Sequence[Document],
+        vectors: Optional[np.ndarray],
+        index,
+        hashes: List[str],
+        model: str,
+        config: Optional[IndexConfig] = None,
+    ):
+        self.documents = documents
+        self.vectors = vectors
+        self.index = index
+        self.hashes = hashes
+        self.model = model
+        self.config = config or IndexConfig()
+        self.signature = _signature(hashes)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def job_vectors(self, rows) -> np.ndarray:
+        """float32 copies of the given rows' vectors"""
+        return np.asarray(self.vectors[rows], dtype="float32")
+
+    def _scores(self, queries: np.ndarray) -> np.ndarray:
+        if self.vectors.dtype == np.float32:
+            return queries @ self.vectors.T
+        scores = np.empty((len(queries), len(self.vectors)), dtype="float32")
+        for start in range(0, len(self.vectors), _CONVERT_ROWS):
+            block = np.asarray(self.vectors[start : start + _CONVERT_ROWS], dtype="float32")
+            scores[:, start : start + len(block)] = queries @ block.T
+        return scores
+
+    def search(
+        self,
+        query_vector: List[float],
+        k: int,
+        mask: Optional[np.ndarray] = None,
+        min_similarity: Optional[float] = None,
+    ) -> List[Tuple[Document, float, int]]:
+        """
+        Return (document, cosine similarity, row) for the k most similar jobs.
+
+        If a boolean row mask is given, only rows where it is True are
+        searched (filtered inside FAISS, not after).
+        """
+        if k <= 0:
+            return []
+
+        similarities, rows = self.search_batch([query_vector], k, mask, min_similarity)
+
+        return [
+            (self.documents[row], float(similarity), int(row))
+            for similarity, row in zip(similarities[0], rows[0])
+            if row != -1
+        ]
+
+    def search_batch(
+        self,
+        query_vectors,
+        k: int,
+        mask: Optional[np.ndarray] = None,
+        min_similarity: Optional[float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k (similarities, rows) for many queries at once, one row per
+        query, most similar first; rows are -1 past the available results
+        and for hits below min_similarity.
+
+        The exact index is scored as one matrix multiply against the stored
+        job matrix (chunked to bound memory); approximate indexes use a
+        single multi-query FAISS search.
+        """
+        queries = normalize_rows(np.asarray(query_vectors, dtype="float32"))
+        k = min(k, len(self.documents))
+        if mask is not None:
+            k = min(k, int(mask.sum()))
+        if k <= 0:
+            return _empty_results(len(queries))
+
+        similarities, rows = self._top_k(queries, k, mask)
+        if min_similarity is not None:
+            rows[similarities < min_similarity] = -1
+        return similarities, rows
+
+    def _top_k(
+        self, queries: np.ndarray, k: int, mask: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if self.config.type != "flat":
+            selector = None
+            if mask is not None:
+                # Bit i of the selector bitmap is row i (little-endian bit order)
+                bitmap = np.packbits(mask, bitorder="little")
+                selector = faiss.IDSelectorBitmap(len(mask), faiss.swig_ptr(bitmap))
+            return self.index.search(
+                queries, k, params=self.config.search_params(selector)
+            )
+
+        similarities = np.empty((len(queries), k), dtype="float32")
+        rows = np.empty((len(queries), k), dtype="int64")
+        chunk = max(1, _SCORE_CHUNK_CELLS // len(self.vectors))
+        for start in range(0, len(queries), chunk):
+            scores = self._scores(queries[start : start + chunk])
+            if mask is not None:
+                scores[:, ~mask] = -np.inf
+
+            # Per-row top-k: partition, then sort only the k survivors
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            rows[start : start + chunk] = np.take_along_axis(top, order, axis=1)
+            similarities[start : start + chunk] = np.take_along_axis(
+                top_scores, order, axis=1
+            )
+
+        return similarities, rows
+
+
+class ShardedJobIndex(JobIndex):
+    """
+    JobIndex split into shards, each a JobIndex over its own vector set.
+
+    Queries are scattered to every shard (in the shard pool when it has
+    workers), each shard applies the row mask and min_similarity and
+    returns its own top-k, and the per-shard lists are merged with a heap.
+    Rows are global, numbered like the documents.
+    """
+
+    def __init__(
+        self,
+        documents: Sequence[Document],
+        shards: List[JobIndex],
+        shard_dirs: List[str],
+        shard_rows: List[np.ndarray],
+        hashes: List[str],
+        model: str,
+        config: Optional[IndexConfig] = None,
+        workers: int = JOB_INDEX_SHARD_WORKERS,
+    ):
+        super().__init__(documents, None, None, hashes, model, config)
+        self.shards = shards
+        self.shard_dirs = shard_dirs
+        self.shard_rows = shard_rows
+        self.workers = workers
+        self._shard_of = np.zeros(len(hashes), dtype=np.int32)
+        self._local_row = np.zeros(len(hashes), dtype=np.int64)
+        for i, rows in enumerate(shard_rows):
+            self._shard_of[rows] = i
+            self._local_row[rows] = np.arange(len(rows))
+
+    def job_vectors(self, rows) -> np.ndarray:
+        rows = np.asarray(rows, dtype=np.int64)
+        dimension = max((shard.vectors.shape[1] for shard in self.shards if len(shard)), default=0)
+        vectors = np.zeros((len(rows), dimension), dtype="float32")
+        shard_of = self._shard_of[rows]
+        for i, shard in enumerate(self.shards):
+            selected = np.flatnonzero(shard_of == i)
+            if len(selected):
+                vectors[selected] = shard.job_vectors(self._local_row[rows[selected]])
+        return vectors
+
+    def warm(self) -> None:
+        """Open every shard in the shard pool ahead of the first search"""
+        if self.workers <= 0:
+            return
+        pool = get_shard_pool(self.workers)
+        try:
+            futures = [
+                pool.submit(_open_shard, shard_dir, shard.signature, self.config)
+                for _ in range(self.workers)
+                for shard_dir, shard in zip(self.shard_dirs, self.shards)
+                if len(shard)
+            ]
+            for future in futures:
+                future.result()
+        except BrokenProcessPool:
+            _discard_shard_pool(pool)
+            raise
+
+    def search_batch(
+        self,
+        query_vectors,
+        k: int,
+        mask: Optional[np.ndarray] = None,
+        min_similarity: Optional[float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        queries = normalize_rows(np.asarray(query_vectors, dtype="float32"))
+        k = min(k, len(self.documents))
+        if mask is not None:
+            k = min(k, int(mask.sum()))
+        if k <= 0:
+            return _empty_results(len(queries))
+
+        # 1. Scatter: every shard with candidate rows searches its own top-k
+        pool = get_shard_pool(self.workers) if self.workers > 0 else None
+        pending = []
+        for i, (shard, rows) in enumerate(zip(self.shards, self.shard_rows)):
+            shard_mask = mask[rows] if mask is not None else None
+            if len(shard) == 0 or (shard_mask is not None and not shard_mask.any()):
+                continue
+            future = None
+            if pool is not None:
+                try:
+                    future = pool.submit(
+                        _search_shard,
+                        self.shard_dirs[i],
+                        shard.signature,
+                        self.config,
+                        queries,
+                        k,
+                        shard_mask,
+                        min_similarity,
+                    )
+                except Exception as e:
+                    if isinstance(e, BrokenProcessPool):
+                        _discard_shard_pool(pool)
+                    print(f"Shard {i} not submitted to the pool ({e}), searching in-process")
+            pending.append((i, shard_mask, future))
+
+        results = []
+        for i, shard_mask, future in pending:
+            shard_results = None
+            if future is not None:
+                try:
+                    shard_results = future.result()
+                except Exception as e:
+                    # A dead worker, or the shard was rebuilt on disk meanwhile
+                    if isinstance(e, BrokenProcessPool):
+                        _discard_shard_pool(pool)
+                    print(f"Shard {i} search failed in the pool ({e}), searching in-process")
+            if shard_results is None:
+                shard_results = self.shards[i].search_batch(
+                    queries, k, shard_mask, min_similarity
+                )
+            results.append((self.shard_rows[i], shard_results))
+
+        # 2. Gather: heap-merge the per-shard lists (each most similar first)
+        similarities = np.full((len(queries), k), -np.inf, dtype="float32")
+        rows = np.full((len(queries), k), -1, dtype="int64")
+        for q in range(len(queries)):
+            streams = []
+            for shard_rows, (shard_similarities, local_rows) in results:
+                hits = local_rows[q] >= 0
+                streams.append(
+                    zip(
+                        shard_similarities[q][hits].tolist(),
+                        shard_rows[local_rows[q][hits]].tolist(),
+                    )
+                )
+            merged = list(islice(heapq.merge(*streams, key=lambda hit: -hit[0]), k))
+            if merged:
+                similarities[q, : len(merged)], rows[q, : len(merged)] = zip(*merged)
+        return similarities, rows
+
+
+def _empty_results(queries: int) -> Tuple[np.ndarray, np.ndarray]:
+    empty = np.zeros((queries, 0))
+    return empty.astype("float32"), empty.astype("int64")
+
+
+def get_shard_pool(workers: int = JOB_INDEX_SHARD_WORKERS) -> ProcessPoolExecutor:
+    """
+    Process pool searching index shards (spawned, so no inherited locks),
+    started again after a dead worker broke the previous one
+    """
+    global _shard_pool
+    with _lock:
+        if _shard_pool is None:
+            _shard_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _shard_pool
+
+
+def _discard_shard_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a pool a dead worker broke; the next get_shard_pool starts anew"""
+    global _shard_pool
+    with _lock:
+        if _shard_pool is not pool:
+            return
+        print("Shard pool is broken, starting a new one")
+        _shard_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_shard_pool() -> None:
+    global _shard_pool
+    if _shard_pool is not None:
+        _shard_pool.shutdown(wait=False, cancel_futures=True)
+        _shard_pool = None
+
+
+def _open_shard(model_dir: str, signature: str, config: IndexConfig) -> JobIndex:
+    """A saved shard at the given version, opened once per pool process"""
+    key = f"{model_dir}:{config.type}"
+    shard = _open_shards.get(key)
+    if shard is None or shard.signature != signature:
+        hashes, vectors = _load_version(model_dir, signature)
+        if vectors is None:
+            raise RuntimeError(f"{model_dir} is not at version {signature}")
+        index = _load_or_build_index(model_dir, signature, vectors, config)
+        shard = JobIndex(range(len(hashes)), vectors, index, hashes, "", config)
+        _open_shards[key] = shard
+    return shard
+
+
+def _search_shard(
+    model_dir: str,
+    signature: str,
+    config: IndexConfig,
+    queries: np.ndarray,
+    k: int,
+    mask: Optional[np.ndarray],
+    min_similarity: Optional[float],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Shard pool task: top-k of one shard, rows local to the shard"""
+    return _open_shard(model_dir, signature, config).search_batch(
+        queries, k, mask, min_similarity
+    )
+
+
+class _DocumentRows(Sequence):
+    def __init__(self, documents: Sequence[Document], rows: np.ndarray):
+        self.documents = documents
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, i):
+        return self.documents[int(self.rows[i])]
+
+
+def shard_of(document_hash: str, shards: int) -> int:
+    """Shard of a document, by content hash: a new job changes one shard"""
+    return int(document_hash[:8], 16) % shards
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize each row so inner product equals cosine similarity"""
+    vectors = np.asarray(vectors, dtype="float32")
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+
+def document_hash(text: str, model: str) -> str:
+    """Content hash of a job document, scoped to the embedding model"""
+    return hashlib.sha256(f"{model}\n{text}".encode("utf-8")).hexdigest()
+
+
+def _signature(hashes: List[str]) -> str:
+    return hashlib.sha256("\n".join(hashes).encode("utf-8")).hexdigest()[:16]
+
+
+def _model_dir(model: str, index_dir: str) -> str:
+    return os.path.join(index_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", model))
+
+
+def _version_paths(model_dir: str, signature: str) -> Dict[str, str]:
+    return {
+        "hashes": os.path.join(model_dir, f"hashes-{signature}.json"),
+        "vectors": os.path.join(model_dir, f"vectors-{signature}.npy"),
+    }
+
+
+def _index_path(model_dir: str, signature: str, spec: str) -> str:
+    return os.path.join(model_dir, f"index-{signature}-{spec}.faiss")
+
+
+def _atomic_write(path: str, write) -> None:
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _load_version(model_dir: str, signature: str) -> Tuple[List[str], Optional[np.ndarray]]:
+    """
+    Load a saved vector set, or nothing if missing or inconsistent.
+
+    Vectors are saved normalized, so they are used as stored (memory-mapped
+    unless JOB_INDEX_MMAP is off).
+    """
+    paths = _version_paths(model_dir, signature)
+    try:
+        with open(paths["hashes"], "r") as f:
+            hashes = json.load(f)
+        vectors = _load_vectors(paths["vectors"])
+    except (OSError, ValueError):
+        return [], None
+
+    if vectors.ndim != 2 or len(hashes) != vectors.shape[0]:
+        return [], None
+    if _signature(hashes) != signature:
+        return [], None
+    return hashes, vectors
+
+
+def _saved_versions(model_dir: str) -> List[str]:
+    """Signatures of the vector sets saved in model_dir, most recently used first"""
+    versions = []
+    try:
+        names = os.listdir(model_dir)
+    except OSError:
+        return []
+    for name in names:
+        match = re.match(r"^hashes-([0-9a-f]+)\.json$", name)
+        if match:
+            try:
+                mtime = os.path.getmtime(os.path.join(model_dir, name))
+            except OSError:
+                continue
+            versions.append((mtime, match.group(1)))
+    return [signature for _, signature in sorted(versions, reverse=True)]
+
+
+def _load_vectors(path: str) -> np.ndarray:
+    return np.load(path, mmap_mode="r" if JOB_INDEX_MMAP else None)
+
+
+def _load_or_build_index(
+    model_dir: str, signature: str, vectors: np.ndarray, config: IndexConfig
+):
+    """
+    Saved FAISS index for these vectors and config, built (and saved) if
+    absent; None for the flat type, which searches the matrix itself
+    """
+    if config.type == "flat":
+        return None
+
+    path = _index_path(model_dir, signature, config.spec(len(vectors)))
+    try:
+        index = _read_index(path)
+        if index.ntotal == len(vectors):
+            return index
+    except RuntimeError:
+        pass
+
+    index = build_faiss_index(vectors, config)
+    os.makedirs(model_dir, exist_ok=True)
+    _atomic_write(path, lambda tmp_path: faiss.write_index(index, tmp_path))
+    if not JOB_INDEX_MMAP:
+        return index
+    # Swap the freshly built copy for a mapping of the file other workers share
+    return _read_index(path)
+
+
+def _read_index(path: str):
+    if not JOB_INDEX_MMAP:
+        return faiss.read_index(path)
+    # MMAP_IFC maps flat codes and HNSW storage too; older FAISS only IVF lists
+    return faiss.read_index(path, getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP))
+
+
+def _save(
+    model_dir: str, hashes: List[str], blocks: Iterable[Tuple[object, np.ndarray]]
+) -> np.ndarray:
+    """
+    Persist a vector set as the current version and return it as loaded.
+
+    `blocks` are (rows, vectors) pieces covering every row; they are written
+    one at a time into the mapped .npy file, never assembled in memory.
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    signature = _signature(hashes)
+    paths = _version_paths(model_dir, signature)
+
+    def write_hashes(path):
+        with open(path, "w") as f:
+            json.dump(hashes, f)
+
+    def write_vectors(path):
+        pieces = iter(blocks)
+        first = next(pieces, None)
+        dimension = first[1].shape[1] if first is not None else 0
+        out = np.lib.format.open_memmap(
+            path, mode="w+", dtype=JOB_VECTOR_DTYPE, shape=(len(hashes), dimension)
+        )
+        for rows, vectors in chain([first] if first is not None else [], pieces):
+            out[rows] = vectors
+        out.flush()
+        del out
+
+    _atomic_write(paths["vectors"], write_vectors)
+    _atomic_write(paths["hashes"], write_hashes)
+    _set_current(model_dir, signature)
+    _prune_versions(model_dir, signature)
+    return _load_vectors(paths["vectors"])
+
+
+def _set_current(model_dir: str, signature: str) -> None:
+    """Mark a saved version as the one in use; pruning keeps the latest used"""
+
+    def write_current(path):
+        with open(path, "w") as f:
+            f.write(signature)
+
+    try:
+        os.utime(_version_paths(model_dir, signature)["hashes"])
+    except OSError:
+        pass
+    _atomic_write(os.path.join(model_dir, "CURRENT"), write_current)
+
+
+def _copy_blocks(vectors: np.ndarray) -> Iterator[Tuple[slice, np.ndarray]]:
+    for start in range(0, len(vectors), JOB_INDEX_BATCH_SIZE):
+        rows = slice(start, start + JOB_INDEX_BATCH_SIZE)
+        yield rows, vectors[rows]
+
+
+def _vector_blocks(
+    documents: Sequence[Document],
+    embeddings,
+    reused: List[Tuple[np.ndarray, List[Tuple[int, int]]]],
+    missing: List[int],
+) -> Iterator[Tuple[List[int], np.ndarray]]:
+    """
+    (rows, vectors) blocks of a new vector set: for each `reused` (saved
+    vectors, [(row, saved row)]) the pairs are copied from that saved set,
+    and `missing` rows embedded, all in batches of JOB_INDEX_BATCH_SIZE
+    """
+    for previous, pairs in reused:
+        for start in range(0, len(pairs), JOB_INDEX_BATCH_SIZE):
+            batch = pairs[start : start + JOB_INDEX_BATCH_SIZE]
+            yield [row for row, _ in batch], previous[[old for _, old in batch]]
+
+    if missing:
+        print(f"Embedding {len(missing)} new or changed jobs...")
+    for start in range(0, len(missing), JOB_INDEX_BATCH_SIZE):
+        rows = missing[start : start + JOB_INDEX_BATCH_SIZE]
+        with external_call("embeddings"):
+            vectors = embeddings.embed_documents(
+                [documents[i].page_content for i in rows]
+            )
+        yield rows, normalize_rows(vectors)
+
+
+def _prune_versions(model_dir: str, current: str) -> None:
+    versions = {}
+    for name in os.listdir(model_dir):
+        # Temporary files belong to writes still in progress
+        if name.endswith(".tmp"):
+            continue
+        match = re.match(r"^(hashes|vectors|index)-([0-9a-f]+)[.-]", name)
+        if match and match.group(2) != current:
+            path = os.path.join(model_dir, name)
+            versions.setdefault(match.group(2), []).append(path)
+
+    stale = sorted(
+        versions.items(),
+        key=lambda item: max(os.path.getmtime(p) for p in item[1]),
+        reverse=True,
+    )[_KEEP_VERSIONS:]
+
+    for _, paths in stale:
+        for path in paths:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def build_faiss_index(vectors: np.ndarray, config: Optional[IndexConfig] = None):
+    """Inner-product FAISS index of the configured type over normalized vectors"""
+    config = config or IndexConfig()
+    dimension = vectors.shape[1]
+
+    if config.type == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, config.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = config.ef_construction
+    elif config.type == "ivf":
+        quantizer = faiss.IndexFlatIP(dimension)
+        nlist = config.nlist_for(len(vectors))
+        index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+        # FAISS samples at most 256 points per centroid; take an even
+        # stride instead of converting the whole matrix
+        step = max(1, len(vectors) // (256 * nlist))
+        index.train(np.ascontiguousarray(vectors[::step], dtype="float32"))
+    else:
+        index = faiss.IndexFlatIP(dimension)
+
+    # Add in batches so a mapped or float16 matrix is never copied whole
+    for start in range(0, len(vectors), JOB_INDEX_BATCH_SIZE * 10):
+        index.add(
+            np.ascontiguousarray(
+                vectors[start : start + JOB_INDEX_BATCH_SIZE * 10], dtype="float32"
+            )
+        )
+    return index
+
+
+def load_job_index(
+    documents: Sequence[Document],
+    embeddings,
+    model: str = EMBEDDING_MODEL,
+    index_dir: str = JOB_INDEX_DIR,
+    config: Optional[IndexConfig] = None,
+    hashes: Optional[List[str]] = None,
+) -> Optional[JobIndex]:
+    """
+    Return the embedding index for the given job documents.
+
+    Vectors are looked up by content hash in memory, then in every version
+    kept on disk (so catalogs sharing index_dir reuse each other's vectors);
+    only documents whose text (or the embedding model) is in none of them
+    are embedded. The FAISS index is saved per vector set and index config.
+
+    With embeddings=None only persisted vectors are used (e.g. a startup
+    warm-up); returns None if any document would need embedding.
+
+    `hashes` are the documents' document_hash values if already known, so
+    the document text need not be rebuilt on every call.
+    """
+    config = config or JOB_INDEX_CONFIG
+    if hashes is None:
+        hashes = [document_hash(doc.page_content, model) for doc in documents]
+    signature = _signature(hashes)
+    model_dir = _model_dir(model, index_dir)
+    memo_key = f"{model_dir}:{config.spec(len(documents))}"
+
+    # 1. Same documents as the last request: reuse vectors and index as-is
+    cached = _loaded.get(memo_key)
+    if cached is not None and cached.signature == signature:
+        return JobIndex(documents, cached.vectors, cached.index, hashes, model, config)
+
+    # One build per model_dir at a time: concurrent callers wait for it and
+    # then find its result in the memo
+    with _build_lock(model_dir):
+        cached = _loaded.get(memo_key)
+        if cached is None or cached.signature != signature:
+            # This exact set may be on disk already: saved by another worker,
+            # or by an earlier request for another catalog in between
+            saved_hashes, saved_vectors = _load_version(model_dir, signature)
+            if saved_vectors is not None:
+                if saved_vectors.dtype != np.dtype(JOB_VECTOR_DTYPE):
+                    # Saved in another dtype: rewritten once
+                    saved_vectors = _save(model_dir, saved_hashes, _copy_blocks(saved_vectors))
+                else:
+                    _set_current(model_dir, signature)
+                cached = JobIndex([], saved_vectors, None, saved_hashes, model, config)
+
+        if cached is not None and cached.signature == signature:
+            if _loaded.get(memo_key) is not cached:
+                cached.index = _load_or_build_index(
+                    model_dir, signature, cached.vectors, config
+                )
+                _loaded[memo_key] = cached
+            return JobIndex(
+                documents, cached.vectors, cached.index, hashes, model, config
+            )
+
+        if not documents:
+            return JobIndex([], None, None, [], model, config)
+
+        # 2. Reuse every vector whose text is unchanged in the memo or any
+        # saved version, embed the rest
+        reused = []
+        missing = list(range(len(hashes)))
+        saved = (_load_version(model_dir, version) for version in _saved_versions(model_dir))
+        sources = chain([(cached.hashes, cached.vectors)] if cached is not None else [], saved)
+        seen = set()
+        for source_hashes, source_vectors in sources:
+            if not missing:
+                break
+            version = _signature(source_hashes)
+            if source_vectors is None or version in seen:
+                continue
+            seen.add(version)
+            known = {h: row for row, h in enumerate(source_hashes)}
+            pairs = [(i, known[hashes[i]]) for i in missing if hashes[i] in known]
+            if pairs:
+                reused.append((source_vectors, pairs))
+                missing = [i for i in missing if hashes[i] not in known]
+
+        if missing and embeddings is None:
+            return None
+
+        # 3. Write the new set batch by batch for other workers and
+        # restarts, then build the index over the saved (mapped) copy
+        vectors = _save(
+            model_dir,
+            hashes,
+            _vector_blocks(documents, embeddings, reused, missing),
+        )
+        index = _load_or_build_index(model_dir, signature, vectors, config)
+
+        job_index = JobIndex(documents, vectors, index, hashes, model, config)
+        _loaded[memo_key] = job_index
+        return job_index
+
+
+def _build_lock(model_dir: str) -> threading.Lock:
+    with _lock:
+        return _build_locks.setdefault(model_dir, threading.Lock())
+
+
+def load_sharded_job_index(
+    documents: Sequence[Document],
+    embeddings,
+    shards: int = JOB_INDEX_SHARDS,
+    model: str = EMBEDDING_MODEL,
+    index_dir: str = JOB_INDEX_DIR,
+    config: Optional[IndexConfig] = None,
+    hashes: Optional[List[str]] = None,
+    workers: int = JOB_INDEX_SHARD_WORKERS,
+) -> Optional[ShardedJobIndex]:
+    """
+    load_job_index split into `shards` indexes under index_dir/shards-<n>/.
+
+    Each shard is persisted, memoized and rebuilt on its own, so a catalog
+    change re-embeds and rebuilds only the shards whose jobs changed.
+    Returns None under the same conditions as load_job_index.
+    """
+    config = config or JOB_INDEX_CONFIG
+    if hashes is None:
+        hashes = [document_hash(doc.page_content, model) for doc in documents]
+    signature = _signature(hashes)
+    memo_key = f"{_model_dir(model, index_dir)}:{shards}:{config.spec(len(documents))}"
+
+    cached = _loaded_sharded.get(memo_key)
+    if cached is not None and cached.signature == signature:
+        return cached
+
+    assignment = np.fromiter(
+        (shard_of(h, shards) for h in hashes), dtype=np.int32, count=len(hashes)
+    )
+    shard_rows = [np.flatnonzero(assignment == i) for i in range(shards)]
+    shard_dirs = [os.path.join(index_dir, f"shards-{shards}", str(i)) for i in range(shards)]
+
+    loaded = []
+    for i, rows in enumerate(shard_rows):
+        shard = load_job_index(
+            _DocumentRows(documents, rows),
+            embeddings,
+            model=model,
+            index_dir=shard_dirs[i],
+            config=config,
+            hashes=[hashes[row] for row in rows],
+        )
+        if shard is None:
+            return None
+        loaded.append(shard)
+
+    sharded = ShardedJobIndex(
+        documents,
+        loaded,
+        [_model_dir(model, shard_dir) for shard_dir in shard_dirs],
+        shard_rows,
+        hashes,
+        model,
+        config,
+        workers,
+    )
+    with _lock:
+        _loaded_sharded[memo_key] = sharded
+    return sharded
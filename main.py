@@ -1,32 +1,103 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
-from fastapi.responses import JSONResponse
+from fastapi import (
+    FastAPI,
+    UploadFile,
+    File,
+    HTTPException,
+    Form,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional
-import tempfile
-import os
+from typing import Callable, Optional
 from models import ArtifactPack
 from data_extraction import (
-    extract_resume_text,
-    fetch_github,
-    scrape_page,
+    extract_resume_text_async,
+    shutdown_pdf_pool,
+    fetch_github_async,
+    scrape_page_async,
+    fetch_sources,
+    close_http_client,
+    PDF_TIMEOUT,
+    GITHUB_TIMEOUT,
+    SCRAPE_TIMEOUT,
     ingest_linkedin,
     build_data_pool,
     analyze_resume_data,
+    analysis_cache_key,
+    get_cached_analysis,
+    store_analysis,
 )
 from note import generate_recruiter_notes
-from models import ArtifactPack
+from models import ArtifactPack, JobFilters
 from matching import (
     match_jobs_with_ai,
+    match_jobs_batch,
+    match_cache_stats,
+    resolve_reasoning,
+    REASONING_MODES,
+    REASONING_TOP_N,
+    stream_match_jobs_with_ai,
     create_ai_apply_queue,
-    load_jobs_from_file,
-    filter_automatable_jobs,
+    warm_up,
 )
+from catalog import DEFAULT_JOBS_FILE, FACET_FIELDS, get_catalog
+from job_index import shutdown_shard_pool
+from sandbox import score_sandbox_batch
+from metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    REQUEST_DURATION,
+    SERVER_TIMING,
+    render_prometheus,
+    server_timing_header,
+    stage_timer,
+    start_request_timings,
+)
+from contextlib import asynccontextmanager
+import asyncio
 import json
+import time
 from typing import Optional
 
+
+# Set once the startup warm-up finishes; reported by /ready
+_readiness: dict = {"ready": False}
+
+
+async def _warm_up():
+    """Load the default catalog, job index and model clients off the event loop"""
+    start = time.perf_counter()
+    try:
+        with stage_timer("warm_up"):
+            details = await asyncio.to_thread(warm_up, DEFAULT_JOBS_FILE)
+    except FileNotFoundError:
+        print(f"Jobs file not found at startup: {DEFAULT_JOBS_FILE}")
+        details = {"error": "jobs file not found"}
+    except Exception as e:
+        # Still ready: the first request loads whatever warm-up couldn't
+        print(f"Warm-up failed: {e}")
+        details = {"error": str(e)}
+    _readiness.update(details, ready=True, warm_up_s=round(time.perf_counter() - start, 3))
+    print(f"Warm-up finished in {_readiness['warm_up_s']}s")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so the server accepts connections (and
+    # answers liveness checks on /) right away; /ready reports completion
+    warm_up_task = asyncio.create_task(_warm_up())
+    yield
+    warm_up_task.cancel()
+    shutdown_pdf_pool()
+    shutdown_shard_pool()
+    await close_http_client()
+
+
 app = FastAPI(
     title="AI Summit 2026",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -38,6 +109,34 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def record_request_timings(request: Request, call_next):
+    """Request latency histogram and the optional Server-Timing header"""
+    timings = start_request_timings()
+    start = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - start
+
+    # Route template, not the raw path, to keep label cardinality bounded
+    route = request.scope.get("route")
+    REQUEST_DURATION.observe(
+        elapsed,
+        request.method,
+        route.path if route is not None else "unmatched",
+        str(response.status_code),
+    )
+    # Streaming bodies are still running here; only stages so far are listed
+    if SERVER_TIMING:
+        response.headers["Server-Timing"] = server_timing_header(timings, elapsed)
+    return response
+
+
+@app.get("/metrics")
+async def metrics():
+    """Stage latency histograms and external call counters (Prometheus format)"""
+    return PlainTextResponse(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @app.get("/")
 async def root():
     return {
@@ -45,39 +144,56 @@ async def root():
     }
 
 
+@app.get("/ready")
+async def ready():
+    """Readiness: 503 until the startup warm-up has finished"""
+    if not _readiness["ready"]:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready", **{k: v for k, v in _readiness.items() if k != "ready"}}
+
+
 @app.post("/analyze", response_model=ArtifactPack)
 async def analyze_resume(
     resume: UploadFile = File(..., description="Resume PDF file"),
     github_username: Optional[str] = Form(None, description="GitHub username"),
     portfolio_url: Optional[str] = Form(None, description="Portfolio website URL"),
     linkedin_text: Optional[str] = Form(None, description="LinkedIn profile text"),
-    gemini_api_key: str = Form(..., description="Google Gemini API Key")
+    gemini_api_key: str = Form(..., description="Google Gemini API Key"),
+    response: Response = None,
 ):
     if not resume.filename.endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            content = await resume.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-
-        resume_text = extract_resume_text(tmp_file_path)
-        os.unlink(tmp_file_path)
-        github_data = None
+        content = await resume.read()
+
+        # Identical resubmission: skip PDF parsing, scraping and the LLM call
+        cache_key = analysis_cache_key(
+            content, github_username, portfolio_url, linkedin_text
+        )
+        cached = await asyncio.to_thread(get_cached_analysis, cache_key)
+        if cached is not None:
+            response.headers["X-Analysis-Cache"] = "hit"
+            return cached
+        response.headers["X-Analysis-Cache"] = "miss"
+
+        # Fetch every source concurrently; a failed optional source is dropped
+        sources = {"resume": (extract_resume_text_async(content), PDF_TIMEOUT)}
         if github_username:
-            try:
-                github_data = fetch_github(github_username)
-            except Exception as e:
-                print(f"Error fetching GitHub data: {e}")
-                github_data = None
-        portfolio_pages = None
+            sources["github"] = (fetch_github_async(github_username), GITHUB_TIMEOUT)
         if portfolio_url:
-            try:
-                portfolio_pages = scrape_page(portfolio_url)
-            except Exception as e:
-                print(f"Error scraping portfolio: {e}")
-                portfolio_pages = None
+            sources["portfolio"] = (scrape_page_async(portfolio_url), SCRAPE_TIMEOUT)
+
+        fetched, source_errors = await fetch_sources(sources)
+
+        if "resume" in source_errors:
+            raise RuntimeError(f"resume: {source_errors['resume']}")
+        if source_errors:
+            response.headers["X-Source-Errors"] = json.dumps(source_errors)
+
+        resume_text = fetched["resume"]
+        github_data = fetched.get("github")
+        portfolio_pages = fetched.get("portfolio")
         linkedin_processed = ingest_linkedin(linkedin_text) if linkedin_text else None
         data_pool = build_data_pool(
             resume_text=resume_text,
@@ -87,7 +203,11 @@ async def analyze_resume(
             project_links=[],
         )
 
-        result = analyze_resume_data(data_pool, gemini_api_key)
+        result = await asyncio.to_thread(analyze_resume_data, data_pool, gemini_api_key)
+
+        # Only cache packs built from every requested source
+        if not source_errors:
+            await asyncio.to_thread(store_analysis, cache_key, result)
 
         return result
 
@@ -103,14 +223,8 @@ async def extract_text_from_resume(
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            content = await resume.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-
-        text = extract_resume_text(tmp_file_path)
-
-        os.unlink(tmp_file_path)
+        content = await resume.read()
+        text = await extract_resume_text_async(content)
 
         return {"text": text}
 
@@ -120,7 +234,7 @@ async def extract_text_from_resume(
 @app.get("/github/{username}")
 async def get_github_data(username: str):
     try:
-        data = fetch_github(username)
+        data = await fetch_github_async(username)
         return data
     except Exception as e:
         raise HTTPException(
@@ -131,7 +245,7 @@ async def get_github_data(username: str):
 @app.post("/scrape")
 async def scrape_portfolio(url: str = Form(..., description="Portfolio URL to scrape")):
     try:
-        data = scrape_page(url)
+        data = await scrape_page_async(url)
         return data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error scraping page: {str(e)}")
@@ -146,6 +260,30 @@ async def match_jobs_with_ai_endpoint(
     ),
     api_key: str = Form(..., description="Google Gemini API Key"),
     jobs_file: Optional[str] = Form("jobs.json", description="Path to jobs.json file"),
+    stream: Optional[str] = Form(
+        None, description="Stream progress frames as 'ndjson' or 'sse'"
+    ),
+    reasoning: Optional[str] = Form(
+        "eager",
+        description="'eager', 'lazy' (reasoning ids, resolve via "
+        "/match-jobs-ai/reasoning) or 'top_n'",
+    ),
+    reasoning_top_n: Optional[int] = Form(
+        REASONING_TOP_N, description="Matches reasoned eagerly in 'top_n' mode"
+    ),
+    category: Optional[str] = Form(None, description="Only jobs in this category"),
+    experience_level: Optional[str] = Form(
+        None, description="Only jobs at this experience level"
+    ),
+    employment_type: Optional[str] = Form(
+        None, description="Only jobs with this employment type"
+    ),
+    location: Optional[str] = Form(
+        None, description="Only jobs whose location contains this text"
+    ),
+    remote: Optional[bool] = Form(
+        None, description="True for remote jobs only, False to exclude them"
+    ),
 ):
     try:
         # 1. Manually parse the JSON string into the Pydantic model
@@ -157,6 +295,41 @@ async def match_jobs_with_ai_endpoint(
                 status_code=400, detail=f"Invalid ArtifactPack JSON: {str(e)}"
             )
 
+        filters = JobFilters(
+            category=category,
+            experience_level=experience_level,
+            employment_type=employment_type,
+            location=location,
+            remote=remote,
+        )
+
+        if reasoning not in REASONING_MODES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"reasoning must be one of {', '.join(REASONING_MODES)}",
+            )
+
+        if stream:
+            if stream not in STREAM_MEDIA_TYPES:
+                raise HTTPException(
+                    status_code=400, detail="stream must be 'ndjson' or 'sse'"
+                )
+
+            frames = stream_match_jobs_with_ai(
+                artifact_pack=artifact_obj,
+                jobs_file_path=jobs_file,
+                top_k=top_k,
+                api_key=api_key,
+                min_similarity=min_similarity,
+                filters=filters,
+                reasoning=reasoning,
+                reasoning_top_n=reasoning_top_n,
+            )
+            return StreamingResponse(
+                _encode_match_stream(frames, stream, top_k, min_similarity),
+                media_type=STREAM_MEDIA_TYPES[stream],
+            )
+
         # 2. Use the parsed object in your matching function
         matches = await match_jobs_with_ai(
             artifact_pack=artifact_obj,
@@ -164,25 +337,177 @@ async def match_jobs_with_ai_endpoint(
             top_k=top_k,
             api_key=api_key,
             min_similarity=min_similarity,
+            filters=filters,
+            reasoning=reasoning,
+            reasoning_top_n=reasoning_top_n,
         )
 
-        apply_queue = create_ai_apply_queue(matches)
+        return _match_response(matches, top_k, min_similarity)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"AI matching failed: {str(e)}")
+
+
+@app.post("/match-jobs-ai/batch")
+async def match_jobs_batch_endpoint(
+    artifact_packs: str = Form(
+        ..., description="JSON array of Student artifact packs"
+    ),
+    top_k: Optional[int] = Form(30, description="Number of top matches per student"),
+    min_similarity: Optional[float] = Form(
+        0.3, description="Minimum similarity threshold (0-1)"
+    ),
+    api_key: str = Form(..., description="Google Gemini API Key"),
+    jobs_file: Optional[str] = Form("jobs.json", description="Path to jobs.json file"),
+    include_reasoning: Optional[bool] = Form(
+        False, description="Generate LLM reasoning for every match (slow)"
+    ),
+    category: Optional[str] = Form(None, description="Only jobs in this category"),
+    experience_level: Optional[str] = Form(
+        None, description="Only jobs at this experience level"
+    ),
+    employment_type: Optional[str] = Form(
+        None, description="Only jobs with this employment type"
+    ),
+    location: Optional[str] = Form(
+        None, description="Only jobs whose location contains this text"
+    ),
+    remote: Optional[bool] = Form(
+        None, description="True for remote jobs only, False to exclude them"
+    ),
+):
+    """
+    Match many students against the catalog in one pass. Filters apply to
+    every student; results come back in input order.
+    """
+    try:
+        try:
+            packs_data = json.loads(artifact_packs)
+            if not isinstance(packs_data, list):
+                raise ValueError("expected a JSON array")
+            packs = [ArtifactPack(**pack) for pack in packs_data]
+        except Exception as e:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid ArtifactPack JSON: {str(e)}"
+            )
+
+        filters = JobFilters(
+            category=category,
+            experience_level=experience_level,
+            employment_type=employment_type,
+            location=location,
+            remote=remote,
+        )
+
+        results = await match_jobs_batch(
+            artifact_packs=packs,
+            jobs_file_path=jobs_file,
+            top_k=top_k,
+            api_key=api_key,
+            min_similarity=min_similarity,
+            filters=filters,
+            include_reasoning=include_reasoning,
+        )
 
         return {
             "status": "success",
-            "method": "ai_vector_embeddings",
-            "apply_queue": apply_queue,
-            "metadata": {
-                "total_analyzed": len(matches),
-                "top_k": top_k,
-                "min_similarity": min_similarity,
-                "average_match": apply_queue["average_match_score"],
-            },
+            "method": "ai_vector_embeddings_batch",
+            "results": [
+                {"index": index, **_match_response(matches, top_k, min_similarity)}
+                for index, matches in enumerate(results)
+            ],
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI matching failed: {str(e)}")
 
 
+@app.post("/match-jobs-ai/reasoning")
+async def resolve_match_reasoning(
+    reasoning_ids: str = Form(
+        ..., description="JSON array of reasoning_id values from /match-jobs-ai"
+    ),
+    api_key: str = Form(..., description="Google Gemini API Key"),
+):
+    """
+    AI reasoning for matches returned with reasoning_status "pending".
+    Generated on first request (or already by the background warm-up) and
+    cached for later ones.
+    """
+    try:
+        ids = json.loads(reasoning_ids)
+        if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+            raise ValueError("expected a JSON array of strings")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid reasoning_ids: {str(e)}")
+
+    try:
+        results = await resolve_reasoning(ids, api_key)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Reasoning generation failed: {str(e)}"
+        )
+
+    return {"status": "success", "reasoning": results}
+
+
+@app.get("/match-jobs-ai/cache")
+async def match_cache_stats_endpoint():
+    """Hit / miss counters of the /match-jobs-ai result cache"""
+    return match_cache_stats()
+
+
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def _match_response(matches, top_k, min_similarity) -> dict:
+    with stage_timer("serialization"):
+        apply_queue = create_ai_apply_queue(matches)
+
+    return {
+        "status": "success",
+        "method": "ai_vector_embeddings",
+        "apply_queue": apply_queue,
+        "metadata": {
+            "total_analyzed": len(matches),
+            "top_k": top_k,
+            "min_similarity": min_similarity,
+            "average_match": apply_queue["average_match_score"],
+        },
+    }
+
+
+async def _encode_match_stream(frames, mode: str, top_k, min_similarity):
+    """
+    Serialize match pipeline events as NDJSON lines or SSE events.
+    The summary frame carries the same body as the non-streaming response.
+    """
+
+    def encode(event: str, payload: dict) -> str:
+        if mode == "sse":
+            return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+        return json.dumps({"event": event, **payload}) + "\n"
+
+    try:
+        async for frame in frames:
+            if frame["event"] == "ranking":
+                yield encode("ranking", {"jobs": frame["jobs"]})
+            elif frame["event"] == "match":
+                yield encode(
+                    "match",
+                    {"rank": frame["rank"], "match": frame["match"].model_dump()},
+                )
+            elif frame["event"] == "summary":
+                yield encode(
+                    "summary", _match_response(frame["matches"], top_k, min_similarity)
+                )
+    except Exception as e:
+        # Headers are already sent; report the failure in-band
+        yield encode("error", {"detail": f"AI matching failed: {str(e)}"})
+
+
 @app.post("/explain-match")
 async def explain_job_match(
     job_id: str = Form(..., description="Job ID to explain"),
@@ -203,25 +528,25 @@ async def explain_job_match(
         Detailed match explanation with AI reasoning
     """
     try:
-        from ai_job_matcher import calculate_skill_overlap, generate_ai_match_reasoning
+        from ai_job_matcher import generate_ai_match_reasoning
 
-        # Load jobs
-        all_jobs = load_jobs_from_file(jobs_file)
-        job = next((j for j in all_jobs if j["job_id"] == job_id), None)
+        # Look up job in the shared catalog (a reload parses the file: off the loop)
+        catalog = await asyncio.to_thread(get_catalog(jobs_file).snapshot)
+        job = catalog.get_job(job_id)
 
         if not job:
             raise HTTPException(
                 status_code=404, detail=f"Job {job_id} not found in {jobs_file}"
             )
 
-        # Calculate skill match
-        skill_match = calculate_skill_overlap(
-            job.get("requirements", []), artifact_pack.profile.skills
+        # Calculate skill match from the job's row of the shared skill matrix
+        skill_match = catalog.skills.row_overlap(
+            catalog.row_by_id[job_id], artifact_pack.profile.skills
         )
 
-        # Generate AI reasoning
-        reasoning = generate_ai_match_reasoning(
-            job, artifact_pack, skill_match, gemini_api_key
+        # Generate AI reasoning (a blocking LLM call: off the event loop)
+        reasoning = await asyncio.to_thread(
+            generate_ai_match_reasoning, job, artifact_pack, skill_match, gemini_api_key
         )
 
         return {
@@ -242,8 +567,38 @@ async def explain_job_match(
         )
 
 
+def _not_modified(request: Request, etag: str) -> bool:
+    """True when the client's If-None-Match already names `etag`"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+def _catalog_response(request: Request, catalog, body: Callable[[], dict]) -> Response:
+    """
+    JSON derived from one catalog version, with that version as the ETag:
+    clients revalidate every time and get a 304 until the jobs file changes
+    """
+    headers = {"ETag": f'"{catalog.version}"', "Cache-Control": "no-cache"}
+    if _not_modified(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=body(), headers=headers)
+
+
+async def _snapshot(jobs_file: str):
+    """Current catalog snapshot; a reload parses the file, so off the loop"""
+    try:
+        return await asyncio.to_thread(get_catalog(jobs_file).snapshot)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Jobs file not found: {jobs_file}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading jobs: {str(e)}")
+
+
 @app.get("/jobs/stats")
-async def get_jobs_stats(jobs_file: Optional[str] = "jobs.json"):
+async def get_jobs_stats(request: Request, jobs_file: Optional[str] = "jobs.json"):
     """
     Get statistics about jobs.json
 
@@ -252,44 +607,82 @@ async def get_jobs_stats(jobs_file: Optional[str] = "jobs.json"):
 
     Returns:
         Total jobs, automatable jobs, categories, experience levels, etc.
+        (computed once per catalog version)
     """
-    try:
-        all_jobs = load_jobs_from_file(jobs_file)
-        automatable = filter_automatable_jobs(all_jobs)
-
-        # Count by category
-        tech_jobs = len([j for j in automatable if j.get("category") == "tech"])
-        non_tech_jobs = len([j for j in automatable if j.get("category") == "non-tech"])
-
-        # Count by experience level
-        intern_jobs = len(
-            [j for j in automatable if j.get("experience_level") == "Intern"]
-        )
-        entry_jobs = len(
-            [j for j in automatable if j.get("experience_level") == "Entry"]
-        )
-
-        # Count by location
-        remote_jobs = len(
-            [j for j in automatable if j.get("location", "").lower() == "remote"]
+    catalog = await _snapshot(jobs_file)
+    return _catalog_response(
+        request, catalog, lambda: {**catalog.stats, "file_path": jobs_file}
+    )
+
+
+@app.get("/jobs/facets")
+async def get_jobs_facets(
+    request: Request,
+    fields: Optional[str] = Query(
+        None,
+        description=f"Comma-separated, from {', '.join(FACET_FIELDS)} (default: all)",
+    ),
+    category: Optional[str] = Query(None, description="Only jobs in this category"),
+    experience_level: Optional[str] = Query(
+        None, description="Only jobs at this experience level"
+    ),
+    employment_type: Optional[str] = Query(
+        None, description="Only jobs with this employment type"
+    ),
+    location: Optional[str] = Query(
+        None, description="Only jobs whose location contains this text"
+    ),
+    remote: Optional[bool] = Query(
+        None, description="True for remote jobs only, False to exclude them"
+    ),
+    automatable_only: bool = Query(True, description="Only jobs open to automation"),
+    limit: int = Query(20, ge=1, description="Most common values returned per field"),
+    jobs_file: Optional[str] = "jobs.json",
+):
+    """
+    Job counts grouped by field value (requirements: per skill) for the jobs
+    passing the filters, most common first
+    """
+    selected = list(FACET_FIELDS)
+    if fields:
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in selected if field not in FACET_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown facet fields: {', '.join(unknown)} "
+            f"(expected {', '.join(FACET_FIELDS)})",
         )
 
+    filters = JobFilters(
+        category=category,
+        experience_level=experience_level,
+        employment_type=employment_type,
+        location=location,
+        remote=remote,
+    )
+    catalog = await _snapshot(jobs_file)
+
+    def body() -> dict:
+        total, facets = catalog.facet_counts(selected, filters, automatable_only)
         return {
-            "total_jobs": len(all_jobs),
-            "automatable_jobs": len(automatable),
-            "non_automatable_jobs": len(all_jobs) - len(automatable),
-            "tech_jobs": tech_jobs,
-            "non_tech_jobs": non_tech_jobs,
-            "intern_positions": intern_jobs,
-            "entry_positions": entry_jobs,
-            "remote_jobs": remote_jobs,
-            "file_path": jobs_file,
+            "catalog_version": catalog.version,
+            "matching_jobs": total,
+            "filters": filters.model_dump(exclude_none=True),
+            "automatable_only": automatable_only,
+            "facets": {
+                field: {
+                    "distinct": len(counts),
+                    "values": [
+                        {"value": value, "count": count}
+                        for value, count in counts[:limit]
+                    ],
+                }
+                for field, counts in facets.items()
+            },
         }
 
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail=f"Jobs file not found: {jobs_file}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error loading jobs: {str(e)}")
+    return _catalog_response(request, catalog, body)
 
 
 @app.post("/generate-short-notes-from-queue")
@@ -350,15 +743,15 @@ async def generate_short_notes_from_apply_queue(
             )
 
         # -----------------------------------
-        # Load jobs.json
+        # Look up jobs in the shared catalog
         # -----------------------------------
-        all_jobs = load_jobs_from_file(jobs_file)
+        catalog = await asyncio.to_thread(get_catalog(jobs_file).snapshot)
 
-        selected_jobs = [
-            job
-            for job in all_jobs
-            if job["job_id"] in job_ids and job.get("automation_allowed", False)
-        ]
+        selected_jobs = []
+        for job_id in dict.fromkeys(job_ids):
+            job = catalog.get_job(job_id)
+            if job is not None and job.get("automation_allowed", False):
+                selected_jobs.append(job)
 
         if not selected_jobs:
             raise HTTPException(
@@ -424,60 +817,7 @@ async def sandbox_apply_batch(
         job_entries = queue_payload["apply_queue"]["jobs"]
         notes_list = notes_payload.get("notes", [])
 
-        # Build job_id -> short_note map
-        notes_map = {n["job_id"]: n["short_note"] for n in notes_list}
-
-        results = []
-
-        # -----------------------------
-        # Process each job entry
-        # -----------------------------
-        for entry in job_entries:
-            job = entry["job"]
-            job_id = job["job_id"]
-
-            # HARD SAFETY GATE
-            if not job.get("automation_allowed", False):
-                results.append({"job_id": job_id, "signal": "failure"})
-                continue
-
-            # -----------------------------
-            # Extract & normalize scores
-            # -----------------------------
-            semantic = entry.get("semantic_similarity", 0) / 100
-            skill = entry.get("skill_match_score", 0) / 100
-            match = entry.get("match_score", 0) / 100
-
-            # Base confidence (reuse Part-2 signals)
-            confidence = 0.40 * semantic + 0.35 * skill + 0.25 * match
-
-            # -----------------------------
-            # Recruiter-note sanity check
-            # -----------------------------
-            note = notes_map.get(job_id, "").lower()
-            matched_terms = sum(
-                1 for req in job.get("requirements", []) if req.lower() in note
-            )
-
-            # Penalize slightly if note is weak
-            if matched_terms == 0:
-                confidence *= 0.85
-
-            confidence = round(confidence, 3)
-
-            # -----------------------------
-            # Decision thresholds
-            # -----------------------------
-            if confidence >= 0.25:
-                signal = "success"
-            elif confidence >= 0.23:
-                signal = "processing"
-            else:
-                signal = "failure"
-
-            results.append(
-                {"job_id": job_id, "signal": signal, "confidence": confidence}
-            )
+        results = score_sandbox_batch(job_entries, notes_list)
 
         return {"status": "success", "total_jobs": len(results), "results": results}
 
@@ -1,17 +1,74 @@
+import asyncio
+import hashlib
 import json
-import faiss
-from typing import List, Dict, Optional
+import numpy as np
+from typing import TYPE_CHECKING, AsyncIterator, List, Dict, Optional, Tuple
 from pydantic import BaseModel
-import uuid
-from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import FAISS
+from collections.abc import Sequence
+from itertools import chain
 from langchain_core.documents import Document
 import os
 from dotenv import load_dotenv
-from langchain_community.docstore.in_memory import InMemoryDocstore
+from models import JobFilters, MatchReasoningBatch
+from cache import LRUTTLCache
+from metrics import external_call, stage_timer
+from reasoning_cache import (
+    get_cached_reasoning,
+    get_cached_reasonings,
+    get_reasoning_prompts,
+    get_reasonings_by_id,
+    reasoning_cache_key,
+    store_reasoning,
+    store_reasoning_prompts,
+    store_reasonings,
+)
+from catalog import (
+    DEFAULT_JOBS_FILE,
+    CatalogSnapshot,
+    get_catalog,
+)
+from job_index import (
+    EMBEDDING_MODEL,
+    JOB_INDEX_SHARDS,
+    JobIndex,
+    ShardedJobIndex,
+    document_hash,
+    load_job_index,
+    load_sharded_job_index,
+    normalize_rows,
+)
 load_dotenv()
 
+# langchain_google_genai and the legacy langchain FAISS store are slow to
+# import; they are loaded on first use instead (see warm_up)
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
+
+REASONING_MODEL = "gemini-2.0-flash-exp"
+REASONING_CONCURRENCY = int(os.getenv("REASONING_CONCURRENCY", "8"))
+REASONING_TIMEOUT = float(os.getenv("REASONING_TIMEOUT", "20"))
+# Jobs per structured-output reasoning request (1 = one request per job)
+REASONING_BATCH_SIZE = int(os.getenv("REASONING_BATCH_SIZE", "1"))
+MATCH_CACHE_SIZE = int(os.getenv("MATCH_CACHE_SIZE", "256"))
+MATCH_CACHE_TTL = float(os.getenv("MATCH_CACHE_TTL", "900"))
+
+# eager: reason about every match before responding; lazy: none, hand out
+# reasoning ids instead; top_n: the first reasoning_top_n eagerly, rest lazy
+REASONING_MODES = ("eager", "lazy", "top_n")
+REASONING_TOP_N = int(os.getenv("REASONING_TOP_N", "5"))
+# Background LLM calls warming lazy reasoning ids (0 = only on request)
+REASONING_BACKGROUND_CONCURRENCY = int(
+    os.getenv("REASONING_BACKGROUND_CONCURRENCY", "2")
+)
+
+# Finished match lists, keyed by match_cache_key
+_match_cache = LRUTTLCache(MATCH_CACHE_SIZE, MATCH_CACHE_TTL)
+
+_reasoning_inflight: Dict[str, asyncio.Task] = {}
+_background_tasks: set = set()
+_background_semaphore: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+
+
 class JobMatch(BaseModel):
     """Job match result with AI-powered scoring"""
 
@@ -23,24 +80,11 @@ class JobMatch(BaseModel):
     ai_reasoning: str
     relevant_bullets: List[str]
     priority: str
-
-
-def load_jobs_from_file(jobs_file_path: str = "jobs.json") -> List[Dict]:
-    """Load jobs from JSON file"""
-    with open(jobs_file_path, "r") as f:
-        jobs_data = json.load(f)
-
-    if isinstance(jobs_data, dict) and "jobs" in jobs_data:
-        return jobs_data["jobs"]
-    elif isinstance(jobs_data, list):
-        return jobs_data
-    else:
-        raise ValueError("Invalid jobs.json format")
-
-
-def filter_automatable_jobs(jobs: List[Dict]) -> List[Dict]:
-    """Filter jobs where automation_allowed = true"""
-    return [job for job in jobs if job.get("automation_allowed", True)]
+    # "ready" (LLM reasoning), "pending" (lazy; resolve reasoning_id),
+    # "unavailable" (LLM call failed) or "skipped" (not requested);
+    # ai_reasoning falls back to the scores unless ready
+    reasoning_status: str = "ready"
+    reasoning_id: Optional[str] = None
 
 
 def create_student_profile_text(artifact_pack) -> str:
@@ -85,50 +129,57 @@ def create_student_profile_text(artifact_pack) -> str:
     return "\n\n".join(sections)
 
 
+def create_job_text(job: Dict) -> str:
+    """Text embedded for a job"""
+    job_text_parts = [
+        f"Title: {job['title']}",
+        f"Company: {job['company']}",
+        f"Category: {job.get('category', 'tech')}",
+        f"Experience Level: {job.get('experience_level', 'Entry')}",
+        f"Location: {job.get('location', 'Remote')}",
+        f"Description: {job.get('description', '')}",
+        f"Requirements: {', '.join(job.get('requirements', []))}",
+    ]
+    return "\n".join(job_text_parts)
+
+
 def create_job_documents(jobs: List[Dict]) -> List[Document]:
     """
-    Convert jobs to LangChain Documents for vector storage
+    Convert jobs to LangChain Documents for vector storage. Metadata only
+    holds the job's row in `jobs`; fields are resolved from there.
     """
-    documents = []
+    return [
+        Document(page_content=create_job_text(job), metadata={"row": row})
+        for row, job in enumerate(jobs)
+    ]
 
-    for job in jobs:
-        # Create comprehensive job text
-        job_text_parts = [
-            f"Title: {job['title']}",
-            f"Company: {job['company']}",
-            f"Category: {job.get('category', 'tech')}",
-            f"Experience Level: {job.get('experience_level', 'Entry')}",
-            f"Location: {job.get('location', 'Remote')}",
-            f"Description: {job.get('description', '')}",
-            f"Requirements: {', '.join(job.get('requirements', []))}",
-        ]
 
-        job_text = "\n".join(job_text_parts)
-
-        # Create document with metadata
-        doc = Document(
-            page_content=job_text,
-            metadata={
-                "job_id": job["job_id"],
-                "title": job["title"],
-                "company": job["company"],
-                "category": job.get("category", "tech"),
-                "experience_level": job.get("experience_level", "Entry"),
-                "location": job.get("location", "Remote"),
-                "requirements": job.get("requirements", []),
-                "automation_allowed": job.get("automation_allowed", True),
-                "full_job": job,
-            },
-        )
-        documents.append(doc)
+class JobDocuments(Sequence):
+    """
+    Job documents built on access from catalog rows (same content as
+    create_job_documents), so the job index keeps no copy of the job text
+    """
 
-    return documents
+    def __init__(self, jobs):
+        self.jobs = jobs
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        return Document(page_content=create_job_text(self.jobs[row]), metadata={"row": row})
 
 
 def create_vector_store(jobs: List[Dict], embeddings):
     """
     Create FAISS vector store from jobs using newer initialization syntax
     """
+    import faiss
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_community.vectorstores import FAISS
+
     # Create documents
     documents = create_job_documents(jobs)
 
@@ -150,77 +201,68 @@ def create_vector_store(jobs: List[Dict], embeddings):
     return vectorstore
 
 
-def calculate_skill_overlap(
-    job_requirements: List[str], student_skills: List[str]
-) -> Dict:
-    """Calculate skill overlap percentage"""
-    job_skills_set = set([skill.lower() for skill in job_requirements])
-    student_skills_set = set([skill.lower() for skill in student_skills])
-
-    overlap = job_skills_set.intersection(student_skills_set)
-    missing = job_skills_set - student_skills_set
-
-    if len(job_skills_set) > 0:
-        match_percentage = (len(overlap) / len(job_skills_set)) * 100
-    else:
-        match_percentage = 100
+def embed_bullet_bank(bullet_bank: List, embeddings) -> np.ndarray:
+    """
+    Embed every bullet in the bullet bank once (one batched embedding call),
+    L2-normalized like the job vectors
+    """
+    if not bullet_bank:
+        return np.zeros((0, 0), dtype="float32")
 
-    return {
-        "overlap": list(overlap),
-        "missing": list(missing),
-        "percentage": match_percentage,
-    }
+    bullet_texts = [item.bullet for item in bullet_bank]
+    with external_call("embeddings"):
+        vectors = embeddings.embed_documents(bullet_texts)
+    return normalize_rows(vectors)
 
 
 def get_relevant_bullets_semantic(
-    job_text: str, bullet_bank: List, embeddings, top_k: int = 5
-) -> List[str]:
+    job_vectors: np.ndarray, bullet_vectors: np.ndarray, bullet_bank: List, top_k: int = 5
+) -> List[List[str]]:
     """
-    Find most relevant bullets using semantic similarity with newer FAISS syntax
+    Find the most relevant bullets for each job vector in one batched
+    cosine-similarity computation (rows follow job_vectors)
     """
-    if not bullet_bank:
-        return []
+    if not bullet_bank or len(job_vectors) == 0:
+        return [[] for _ in range(len(job_vectors))]
 
-    # Extract bullet texts
     bullet_texts = [item.bullet for item in bullet_bank]
+    k = min(top_k, len(bullet_texts))
 
-    # Create documents for bullets
-    bullet_docs = [Document(page_content=text) for text in bullet_texts]
+    # Cosine similarity for every (job, bullet) pair; both sides are normalized
+    similarities = job_vectors @ bullet_vectors.T
 
-    # Initialize FAISS index for bullets
-    embedding_dimension = len(embeddings.embed_query("hello world"))
-    index = faiss.IndexFlatL2(embedding_dimension)
+    # Top-k per row, most similar first
+    nearest = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(-similarities, nearest, axis=1).argsort(axis=1)
+    nearest = np.take_along_axis(nearest, order, axis=1)
 
-    # Create bullet vector store with newer syntax
-    bullet_store = FAISS(
-        embedding_function=embeddings,
-        index=index,
-        docstore=InMemoryDocstore(),
-        index_to_docstore_id={},
-    )
+    return [[bullet_texts[i] for i in row] for row in nearest]
 
-    # Add bullet documents
-    bullet_store.add_documents(bullet_docs)
 
-    # Find most similar bullets to job description
-    results = bullet_store.similarity_search(job_text, k=min(top_k, len(bullet_texts)))
+def create_embeddings(api_key: str) -> "GoogleGenerativeAIEmbeddings":
+    """Embedding model used for jobs, profiles and bullets"""
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
-    return [doc.page_content for doc in results]
+    return GoogleGenerativeAIEmbeddings(
+        model=EMBEDDING_MODEL,
+        google_api_key=api_key,
+    )
 
 
-def generate_ai_match_reasoning(
-    job: Dict, artifact_pack, skill_match: Dict, api_key: str
-) -> str:
-    """
-    Use LLM to generate detailed match reasoning
-    """
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash-exp",
+def create_reasoning_llm(api_key: str) -> "ChatGoogleGenerativeAI":
+    """Chat model used for match reasoning"""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        model=REASONING_MODEL,
         temperature=0,
         google_api_key=api_key,
     )
 
-    prompt = f"""Analyze this job match and provide a brief 2-3 sentence reasoning for why this is a good or poor match.
+
+def build_match_reasoning_prompt(job: Dict, artifact_pack, skill_match: Dict) -> str:
+    """Render the match reasoning prompt for one job"""
+    return f"""Analyze this job match and provide a brief 2-3 sentence reasoning for why this is a good or poor match.
 
 JOB:
 Title: {job['title']}
@@ -240,80 +282,519 @@ Missing Skills: {', '.join(skill_match['missing'])}
 
 Provide concise reasoning (2-3 sentences max) explaining the match quality."""
 
-    response = llm.invoke(prompt)
+
+def build_batch_reasoning_prompt(items: List[tuple], artifact_pack) -> str:
+    """Render one prompt asking for reasoning on several (job, skill_match) pairs"""
+    jobs = "\n\n".join(
+        f"""JOB {job['job_id']}:
+Title: {job['title']}
+Company: {job['company']}
+Requirements: {', '.join(job.get('requirements', []))}
+Description: {job.get('description', '')}
+Skill Overlap: {len(skill_match['overlap'])}/{len(job.get('requirements', []))} required skills
+Matching Skills: {', '.join(skill_match['overlap'])}
+Missing Skills: {', '.join(skill_match['missing'])}"""
+        for job, skill_match in items
+    )
+
+    return f"""Analyze each of these job matches for the same student and provide a brief 2-3 sentence reasoning for why each is a good or poor match.
+
+STUDENT PROFILE:
+Skills: {', '.join(artifact_pack.profile.skills)}
+Projects: {len(artifact_pack.profile.projects)} projects
+Internships: {len(artifact_pack.profile.internships)} internships
+
+{jobs}
+
+Return one entry per job with its exact job_id and concise reasoning (2-3 sentences max) explaining the match quality."""
+
+
+def generate_ai_match_reasoning(
+    job: Dict, artifact_pack, skill_match: Dict, api_key: str
+) -> str:
+    """
+    Use LLM to generate detailed match reasoning
+    """
+    prompt = build_match_reasoning_prompt(job, artifact_pack, skill_match)
+    cached = get_cached_reasoning(prompt, REASONING_MODEL)
+    if cached is not None:
+        return cached
+
+    llm = create_reasoning_llm(api_key)
+    with external_call("llm"):
+        response = llm.invoke(prompt)
+    store_reasoning(prompt, REASONING_MODEL, response.content)
     return response.content
 
 
+def _reasoning_coroutines(
+    items: List[tuple],
+    artifact_pack,
+    llm,
+    concurrency: int,
+    timeout: float,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    batch_size: int = REASONING_BATCH_SIZE,
+    shared_tasks: Optional[set] = None,
+) -> list:
+    """
+    One coroutine per (job, skill_match) item resolving to its reasoning.
 
-async def match_jobs_with_ai(
+    The reasoning cache is read once for all items, in a worker thread. With
+    batch_size > 1, uncached items share structured-output requests of up
+    to batch_size jobs; items a batch leaves out fall back to their own
+    call.
+
+    The cache lookup and batch requests run as tasks shared by the
+    coroutines; they are added to `shared_tasks` if given, so a caller
+    abandoning the coroutines can cancel them too.
+    """
+    if shared_tasks is None:
+        shared_tasks = set()
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    prompts = [
+        build_match_reasoning_prompt(job, artifact_pack, skill_match)
+        for job, skill_match in items
+    ]
+    lookup: List[asyncio.Task] = []
+    chunks: List[List[int]] = []
+    chunk_of: Dict[int, int] = {}
+    chunk_tasks: Dict[int, asyncio.Task] = {}
+
+    async def plan() -> List[Optional[str]]:
+        cached = await asyncio.to_thread(
+            get_cached_reasonings, prompts, REASONING_MODEL
+        )
+        if batch_size > 1:
+            # Only uncached items go into batches
+            uncached = [index for index, hit in enumerate(cached) if hit is None]
+            chunks.extend(
+                uncached[start : start + batch_size]
+                for start in range(0, len(uncached), batch_size)
+            )
+            # A lone leftover item is cheaper as a plain call
+            chunk_of.update(
+                (index, chunk)
+                for chunk, indices in enumerate(chunks)
+                if len(indices) > 1
+                for index in indices
+            )
+        return cached
+
+    def cached_reasoning() -> asyncio.Task:
+        # Started by whichever coroutine runs first, awaited by all
+        if not lookup:
+            lookup.append(asyncio.ensure_future(plan()))
+            shared_tasks.add(lookup[0])
+        return lookup[0]
+
+    def chunk_task(chunk: int) -> asyncio.Task:
+        if chunk not in chunk_tasks:
+            indices = chunks[chunk]
+            chunk_tasks[chunk] = asyncio.ensure_future(
+                _generate_reasoning_chunk(
+                    [items[index] for index in indices],
+                    [prompts[index] for index in indices],
+                    artifact_pack,
+                    llm,
+                    semaphore,
+                    timeout,
+                )
+            )
+            shared_tasks.add(chunk_tasks[chunk])
+        return chunk_tasks[chunk]
+
+    async def generate(index: int) -> Optional[str]:
+        cached = (await cached_reasoning())[index]
+        if cached is not None:
+            return cached
+
+        job = items[index][0]
+        if index in chunk_of:
+            batch = await chunk_task(chunk_of[index])
+            if job["job_id"] in batch:
+                return batch[job["job_id"]]
+
+        return await _generate_reasoning(
+            prompts[index], job["job_id"], llm, semaphore, timeout, lookup=False
+        )
+
+    return [generate(index) for index in range(len(items))]
+
+
+async def _generate_reasoning_chunk(
+    items: List[tuple],
+    prompts: List[str],
     artifact_pack,
-    jobs_file_path: str = "jobs.json",
-    top_k: int = 30,
-    api_key: str = "",
-    min_similarity: float = 0.3,
-) -> List[JobMatch]:
+    llm,
+    semaphore: asyncio.Semaphore,
+    timeout: float,
+) -> Dict[str, str]:
     """
-    Main AI-powered job matching function using vector embeddings
+    Reasoning for several jobs from one structured-output request, by job_id.
+    Each result is cached under its job's own prompt; entries that are
+    missing, empty or for unknown job ids are left out.
+    """
+    prompts_by_id = {job["job_id"]: prompt for (job, _), prompt in zip(items, prompts)}
+    structured_llm = llm.with_structured_output(MatchReasoningBatch)
 
-    Args:
-        artifact_pack: Student artifact pack
-        api_key: Google Gemini API key
-        jobs_file_path: Path to jobs.json
-        top_k: Number of top matches to return
-        min_similarity: Minimum similarity score threshold (0-1)
+    async with semaphore:
+        try:
+            with external_call("llm"):
+                response = await asyncio.wait_for(
+                    structured_llm.ainvoke(
+                        build_batch_reasoning_prompt(items, artifact_pack)
+                    ),
+                    timeout,
+                )
+        except Exception as e:
+            print(f"Batched AI reasoning failed for {len(items)} jobs: {e!r}")
+            return {}
+
+    results = {}
+    for item in response.items if response is not None else []:
+        reasoning = item.reasoning.strip()
+        if item.job_id in prompts_by_id and reasoning:
+            results[item.job_id] = reasoning
+    await asyncio.to_thread(
+        store_reasonings,
+        [(prompts_by_id[job_id], reasoning) for job_id, reasoning in results.items()],
+        REASONING_MODEL,
+    )
 
-    Returns:
-        List of JobMatch objects sorted by relevance
+    if len(results) < len(items):
+        print(f"Batched AI reasoning returned {len(results)}/{len(items)} jobs")
+    return results
+
+
+async def _generate_reasoning(
+    prompt: str,
+    label: str,
+    llm,
+    semaphore: asyncio.Semaphore,
+    timeout: float,
+    lookup: bool = True,
+) -> Optional[str]:
     """
-    # 1. Load and filter jobs
-    all_jobs = load_jobs_from_file(jobs_file_path)
-    automatable_jobs = filter_automatable_jobs(all_jobs)
+    Cached reasoning for a prompt (unless the caller already looked), else
+    one bounded LLM call (None on failure). Cache I/O runs in a worker thread.
+    """
+    if lookup:
+        cached = await asyncio.to_thread(get_cached_reasoning, prompt, REASONING_MODEL)
+        if cached is not None:
+            return cached
 
-    print(f"Loaded {len(automatable_jobs)} automatable jobs")
+    async with semaphore:
+        try:
+            with external_call("llm"):
+                response = await asyncio.wait_for(llm.ainvoke(prompt), timeout)
+            await asyncio.to_thread(
+                store_reasoning, prompt, REASONING_MODEL, response.content
+            )
+            return response.content
+        except Exception as e:
+            print(f"AI reasoning failed for {label}: {e!r}")
+            return None
 
-    # 2. Create student profile text for embedding
-    student_text = create_student_profile_text(artifact_pack)
 
-    # 3. Initialize embeddings
-    print("Initializing embeddings...")
-    embeddings = GoogleGenerativeAIEmbeddings(
-        model="models/embedding-001",
-        google_api_key=api_key,
+async def generate_ai_match_reasoning_batch(
+    items: List[tuple],
+    artifact_pack,
+    llm,
+    concurrency: int = REASONING_CONCURRENCY,
+    timeout: float = REASONING_TIMEOUT,
+    batch_size: int = REASONING_BATCH_SIZE,
+) -> List[Optional[str]]:
+    """
+    Generate reasoning for (job, skill_match) pairs concurrently via the async
+    LLM API, at most `concurrency` calls in flight and `timeout` seconds each,
+    `batch_size` jobs per request.
+
+    Returns one entry per item, None where the call failed or timed out.
+    """
+    return await asyncio.gather(
+        *_reasoning_coroutines(
+            items, artifact_pack, llm, concurrency, timeout, batch_size=batch_size
+        )
     )
 
-    # 4. Create vector store from jobs
-    print("Creating vector embeddings for jobs...")
-    vectorstore = create_vector_store(automatable_jobs, embeddings)
 
-    # 5. Perform semantic similarity search
-    print("Finding semantically similar jobs...")
-    results = vectorstore.similarity_search_with_score(
-        student_text,
-        k=min(top_k * 2, len(automatable_jobs)),  # Get more initially, filter later
+def register_lazy_reasoning(
+    items: List[tuple], artifact_pack
+) -> Tuple[List[str], Dict[str, Dict], Dict[str, str]]:
+    """
+    Store the prompts for (job, skill_match) items. Returns their reasoning
+    ids, the stored prompt by id and the reasoning already cached by id.
+
+    The prompts go to the shared prompt cache, so any worker can generate
+    the reasoning later; the text lands in the reasoning cache under the
+    same id. Blocking (cache I/O); run it in a worker thread from async code.
+    """
+    reasoning_ids, stored = [], {}
+    for job, skill_match in items:
+        prompt = build_match_reasoning_prompt(job, artifact_pack, skill_match)
+        reasoning_id = reasoning_cache_key(prompt, REASONING_MODEL)
+        stored[reasoning_id] = {"job_id": job["job_id"], "prompt": prompt}
+        reasoning_ids.append(reasoning_id)
+    store_reasoning_prompts(stored)
+    return reasoning_ids, stored, get_reasonings_by_id(reasoning_ids)
+
+
+def _lookup_reasoning_ids(
+    reasoning_ids: List[str],
+) -> Tuple[Dict[str, str], Dict[str, Optional[Dict]]]:
+    """Blocking: cached reasoning by id, and the stored prompt of the rest"""
+    cached = get_reasonings_by_id(reasoning_ids)
+    pending = [
+        reasoning_id
+        for reasoning_id in reasoning_ids
+        if reasoning_id not in cached and reasoning_id not in _reasoning_inflight
+    ]
+    prompts = get_reasoning_prompts(pending)
+    stored = {reasoning_id: prompts.get(reasoning_id) for reasoning_id in pending}
+    return cached, stored
+
+
+def _resolve_one(
+    reasoning_id: str,
+    stored: Optional[Dict],
+    llm,
+    semaphore: asyncio.Semaphore,
+    timeout: float,
+) -> Optional[asyncio.Task]:
+    """
+    Task generating reasoning for an id from its stored prompt, joining one
+    already in flight. None if the id is unknown.
+    """
+    task = _reasoning_inflight.get(reasoning_id)
+    if task is not None and not task.done():
+        return task
+
+    if stored is None:
+        return None
+
+    task = asyncio.ensure_future(
+        _generate_reasoning(stored["prompt"], stored["job_id"], llm, semaphore, timeout)
     )
+    _reasoning_inflight[reasoning_id] = task
+    task.add_done_callback(lambda _: _reasoning_inflight.pop(reasoning_id, None))
+    return task
 
-    # 6. Process each match
-    matches = []
-    for doc, similarity_score in results:
-        # Similarity score from FAISS is distance (lower = better)
-        # Convert to similarity (0-1, higher = better)
-        semantic_similarity = 1 - similarity_score
 
-        # Skip if below threshold
-        if semantic_similarity < min_similarity:
+async def resolve_reasoning(
+    reasoning_ids: List[str],
+    api_key: str,
+    concurrency: int = REASONING_CONCURRENCY,
+    timeout: float = REASONING_TIMEOUT,
+) -> List[Dict]:
+    """
+    Reasoning for lazy reasoning ids, generating (and caching) what is
+    missing. One {"reasoning_id", "status", "ai_reasoning"} per id, status
+    "ready", "unavailable" (LLM call failed) or "unknown".
+    """
+    results = {}
+    tasks = {}
+    llm = None
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    unique_ids = list(dict.fromkeys(reasoning_ids))
+    cached, stored = await asyncio.to_thread(_lookup_reasoning_ids, unique_ids)
+    for reasoning_id in unique_ids:
+        if reasoning_id in cached:
+            results[reasoning_id] = ("ready", cached[reasoning_id])
             continue
 
-        job = doc.metadata["full_job"]
+        if llm is None:
+            llm = create_reasoning_llm(api_key)
+        task = _resolve_one(
+            reasoning_id, stored.get(reasoning_id), llm, semaphore, timeout
+        )
+        if task is None:
+            results[reasoning_id] = ("unknown", None)
+        else:
+            tasks[reasoning_id] = task
+
+    # shield: a client disconnect must not cancel work others may be awaiting
+    done = await asyncio.gather(*(asyncio.shield(task) for task in tasks.values()))
+    for reasoning_id, ai_reasoning in zip(tasks, done):
+        status = "ready" if ai_reasoning is not None else "unavailable"
+        results[reasoning_id] = (status, ai_reasoning)
+
+    return [
+        {
+            "reasoning_id": reasoning_id,
+            "status": results[reasoning_id][0],
+            "ai_reasoning": results[reasoning_id][1],
+        }
+        for reasoning_id in reasoning_ids
+    ]
+
+
+def _schedule_background_reasoning(
+    pending: Dict[str, Dict],
+    api_key: str,
+    timeout: float = REASONING_TIMEOUT,
+    llm=None,
+) -> None:
+    """
+    Warm lazy reasoning ids (with their stored prompts) in the background,
+    bounded process-wide
+    """
+    global _background_semaphore
+    if REASONING_BACKGROUND_CONCURRENCY <= 0 or not pending:
+        return
+
+    loop = asyncio.get_running_loop()
+    if _background_semaphore is None or _background_semaphore[0] is not loop:
+        _background_semaphore = (
+            loop,
+            asyncio.Semaphore(REASONING_BACKGROUND_CONCURRENCY),
+        )
 
-        # Calculate skill match
-        skill_match = calculate_skill_overlap(
-            job.get("requirements", []), artifact_pack.profile.skills
+    llm = llm or create_reasoning_llm(api_key)
+    for reasoning_id, stored in pending.items():
+        task = _resolve_one(
+            reasoning_id, stored, llm, _background_semaphore[1], timeout
         )
+        if task is not None:
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+
 
-        # Get relevant bullets using semantic search
-        relevant_bullets = get_relevant_bullets_semantic(
-            doc.page_content, artifact_pack.bullet_bank, embeddings, top_k=5
+def _refresh_reasoning(matches: List[JobMatch]) -> List[JobMatch]:
+    """
+    Pick up reasoning generated since lazy matches were cached (blocking:
+    one reasoning cache read)
+    """
+    pending = [
+        match.reasoning_id
+        for match in matches
+        if match.reasoning_status != "ready" and match.reasoning_id is not None
+    ]
+    if not pending:
+        return matches
+
+    generated = get_reasonings_by_id(pending)
+    return [
+        match.model_copy(
+            update={
+                "ai_reasoning": generated[match.reasoning_id],
+                "reasoning_status": "ready",
+            }
         )
+        if match.reasoning_status != "ready" and match.reasoning_id in generated
+        else match
+        for match in matches
+    ]
+
+
+def _load_job_search(
+    jobs_file_path: str,
+    api_key: str,
+    embeddings=None,
+    catalog: Optional[CatalogSnapshot] = None,
+) -> Tuple[CatalogSnapshot, JobIndex, "GoogleGenerativeAIEmbeddings"]:
+    """
+    Catalog snapshot (unless the caller already took one), embeddings
+    client and job index for a search
+    """
+    # 1. Take the current catalog snapshot (reloaded only if jobs.json changed)
+    if catalog is None:
+        with stage_timer("catalog_load"):
+            catalog = get_catalog(jobs_file_path).snapshot()
+    automatable_jobs = catalog.automatable_jobs
+
+    print(f"Loaded {len(automatable_jobs)} automatable jobs")
+
+    # 2. Initialize embeddings
+    if embeddings is None:
+        print("Initializing embeddings...")
+        embeddings = create_embeddings(api_key)
+
+    # 3. Load the persisted job index (embeds only new or changed jobs)
+    print("Loading job vector index...")
+    with stage_timer("job_index_load"):
+        job_index = _open_job_index(catalog, embeddings)
+
+    return catalog, job_index, embeddings
+
+
+def _job_documents(catalog: CatalogSnapshot) -> Tuple[JobDocuments, List[str]]:
+    """Index documents of the automatable jobs and their content hashes"""
+    documents = catalog.derived(
+        "job_documents", lambda: JobDocuments(catalog.automatable_jobs)
+    )
+    hashes = catalog.derived(
+        f"job_hashes:{EMBEDDING_MODEL}",
+        lambda: [document_hash(doc.page_content, EMBEDDING_MODEL) for doc in documents],
+    )
+    return documents, hashes
+
+
+def _open_job_index(catalog: CatalogSnapshot, embeddings) -> Optional[JobIndex]:
+    """The catalog's job index, sharded when JOB_INDEX_SHARDS > 1"""
+    documents, hashes = _job_documents(catalog)
+    if JOB_INDEX_SHARDS > 1:
+        return load_sharded_job_index(documents, embeddings, hashes=hashes)
+    return load_job_index(documents, embeddings, hashes=hashes)
+
+
+def warm_up(jobs_file_path: str = DEFAULT_JOBS_FILE) -> Dict:
+    """
+    Load what the first match request would otherwise pay for: the Gemini
+    client modules, the catalog snapshot and the persisted job index (no
+    embedding calls; a missing or stale index is left to the first request).
+    Blocking.
+    """
+    import langchain_google_genai  # noqa: F401
+
+    with stage_timer("catalog_load"):
+        catalog = get_catalog(jobs_file_path).snapshot()
+    with stage_timer("job_index_load"):
+        job_index = _open_job_index(catalog, None)
+        if isinstance(job_index, ShardedJobIndex):
+            job_index.warm()
+
+    return {
+        "catalog_version": catalog.version,
+        "jobs": len(catalog.jobs),
+        "skipped_job_records": catalog.ingest.skipped_total,
+        "index_loaded": job_index is not None,
+    }
+
+
+def _filter_mask(
+    catalog: CatalogSnapshot, filters: Optional[JobFilters]
+) -> Optional[np.ndarray]:
+    """Metadata filter mask over the job index rows (None = no filtering)"""
+    mask = catalog.filters.mask(filters)
+    if mask is not None:
+        mask = mask[catalog.automatable_rows]
+        print(f"{int(mask.sum())} jobs pass filters")
+    return mask
+
+
+def _score_results(
+    results,
+    catalog: CatalogSnapshot,
+    skill_scores,
+    min_similarity: float,
+    top_k: int,
+) -> List[Dict]:
+    """Combine (semantic_similarity, row) search hits with skill overlap"""
+    ranked = []
+    for semantic_similarity, row in results:
+        # Cosine similarity from the inner-product index (higher = better)
+        # Skip if below threshold (or past the end of the results)
+        if row == -1 or semantic_similarity < min_similarity:
+            continue
+
+        semantic_similarity = float(semantic_similarity)
+        job = catalog.automatable_jobs[row]
+
+        # Look up skill match for this job's catalog row
+        skill_match = skill_scores.as_dict(catalog.automatable_rows[row])
 
         # Calculate combined score
         # 60% semantic similarity + 40% skill match
@@ -321,14 +802,6 @@ async def match_jobs_with_ai(
         combined_score = (semantic_similarity * 0.6) + (skill_match_score * 0.4)
         match_score = combined_score * 100
 
-        # Generate AI reasoning
-        try:
-            ai_reasoning = generate_ai_match_reasoning(
-                job, artifact_pack, skill_match, api_key
-            )
-        except Exception as e:
-            ai_reasoning = f"Semantic similarity: {semantic_similarity:.2%}, Skill match: {skill_match_score:.2%}"
-
         # Determine priority
         if match_score >= 70:
             priority = "high"
@@ -337,25 +810,558 @@ async def match_jobs_with_ai(
         else:
             priority = "low"
 
-        # Create match object
-        job_match = JobMatch(
-            job_id=job["job_id"],
-            job=job,
-            match_score=round(match_score, 2),
-            semantic_similarity=round(semantic_similarity * 100, 2),
-            skill_match_score=round(skill_match_score * 100, 2),
-            ai_reasoning=ai_reasoning,
-            relevant_bullets=relevant_bullets,
-            priority=priority,
+        ranked.append(
+            {
+                "job": job,
+                "row": int(row),
+                "semantic_similarity": semantic_similarity,
+                "skill_match": skill_match,
+                "skill_match_score": skill_match_score,
+                "match_score": match_score,
+                "priority": priority,
+            }
+        )
+
+    # Sort by match score and keep top k
+    ranked.sort(key=lambda entry: round(entry["match_score"], 2), reverse=True)
+    return ranked[:top_k]
+
+
+def _rank_jobs(
+    artifact_pack,
+    jobs_file_path: str,
+    top_k: int,
+    api_key: str,
+    min_similarity: float,
+    filters: Optional[JobFilters] = None,
+    embeddings=None,
+    catalog: Optional[CatalogSnapshot] = None,
+) -> Tuple[List[Dict], JobIndex, "GoogleGenerativeAIEmbeddings"]:
+    """
+    Semantic search + skill overlap scoring, sorted and cut to top_k.
+
+    Blocking (embedding calls); run it in a worker thread from async code.
+    """
+    catalog, job_index, embeddings = _load_job_search(
+        jobs_file_path, api_key, embeddings, catalog
+    )
+
+    # 4. Restrict the search to jobs passing the metadata filters
+    mask = _filter_mask(catalog, filters)
+
+    # 5. Perform semantic similarity search
+    print("Finding semantically similar jobs...")
+    with stage_timer("query_embedding"), external_call("embeddings"):
+        query_vector = embeddings.embed_query(
+            create_student_profile_text(artifact_pack)
+        )
+    with stage_timer("vector_search"):
+        results = job_index.search(
+            query_vector,
+            k=min(top_k * 2, len(job_index)),  # Get more initially, filter later
+            mask=mask,
+            min_similarity=min_similarity,
+        )
+
+    # 6. Score skill overlap against every job at once, then combine
+    with stage_timer("skill_scoring"):
+        skill_scores = catalog.skills.score(artifact_pack.profile.skills)
+        ranked = _score_results(
+            [(similarity, row) for _, similarity, row in results],
+            catalog,
+            skill_scores,
+            min_similarity,
+            top_k,
+        )
+    return ranked, job_index, embeddings
+
+
+def _rank_jobs_batch(
+    artifact_packs: List,
+    jobs_file_path: str,
+    top_k: int,
+    api_key: str,
+    min_similarity: float,
+    filters: Optional[JobFilters] = None,
+    embeddings=None,
+) -> Tuple[List[List[Dict]], JobIndex, "GoogleGenerativeAIEmbeddings"]:
+    """
+    _rank_jobs for many students: one batched embedding call for all
+    profiles and one matrix multiply + per-row top-k against the job matrix.
+    """
+    catalog, job_index, embeddings = _load_job_search(
+        jobs_file_path, api_key, embeddings
+    )
+    mask = _filter_mask(catalog, filters)
+
+    print(f"Embedding {len(artifact_packs)} student profiles...")
+    with stage_timer("query_embedding"), external_call("embeddings"):
+        query_vectors = embeddings.embed_documents(
+            [create_student_profile_text(pack) for pack in artifact_packs],
+            task_type="RETRIEVAL_QUERY",  # same task type as embed_query
+        )
+
+    print("Scoring students against the job matrix...")
+    with stage_timer("vector_search"):
+        similarities, rows = job_index.search_batch(
+            query_vectors, min(top_k * 2, len(job_index)), mask, min_similarity
+        )
+
+    rankings = []
+    with stage_timer("skill_scoring"):
+        for pack, pack_similarities, pack_rows in zip(
+            artifact_packs, similarities, rows
+        ):
+            skill_scores = catalog.skills.score(pack.profile.skills)
+            rankings.append(
+                _score_results(
+                    zip(pack_similarities, pack_rows),
+                    catalog,
+                    skill_scores,
+                    min_similarity,
+                    top_k,
+                )
+            )
+    return rankings, job_index, embeddings
+
+
+def _rank_bullets(
+    ranked: List[Dict], job_index: JobIndex, embeddings, artifact_pack
+) -> List[List[str]]:
+    """Relevant bullets for every ranked job, from the stored job vectors"""
+    if not ranked:
+        return []
+
+    with stage_timer("bullet_ranking"):
+        bullet_vectors = embed_bullet_bank(artifact_pack.bullet_bank, embeddings)
+        return get_relevant_bullets_semantic(
+            job_index.job_vectors([entry["row"] for entry in ranked]),
+            bullet_vectors,
+            artifact_pack.bullet_bank,
+            top_k=5,
+        )
+
+
+def _rank_bullets_batch(
+    rankings: List[List[Dict]], job_index: JobIndex, embeddings, artifact_packs: List
+) -> List[List[List[str]]]:
+    """_rank_bullets for many students with one embedding call for all bullets"""
+    all_bullets = [
+        item
+        for ranked, pack in zip(rankings, artifact_packs)
+        if ranked
+        for item in pack.bullet_bank
+    ]
+    all_vectors = embed_bullet_bank(all_bullets, embeddings)
+
+    bullets = []
+    offset = 0
+    for ranked, pack in zip(rankings, artifact_packs):
+        if not ranked:
+            bullets.append([])
+            continue
+
+        count = len(pack.bullet_bank)
+        bullets.append(
+            get_relevant_bullets_semantic(
+                job_index.job_vectors([entry["row"] for entry in ranked]),
+                all_vectors[offset : offset + count],
+                pack.bullet_bank,
+                top_k=5,
+            )
+        )
+        offset += count
+    return bullets
+
+
+def _ranking_summary(entry: Dict) -> Dict:
+    """Scores of a ranked job, before bullets and reasoning are attached"""
+    job = entry["job"]
+    return {
+        "job_id": job["job_id"],
+        "title": job["title"],
+        "company": job["company"],
+        "match_score": round(entry["match_score"], 2),
+        "semantic_similarity": round(entry["semantic_similarity"] * 100, 2),
+        "skill_match_score": round(entry["skill_match_score"] * 100, 2),
+        "priority": entry["priority"],
+    }
+
+
+def _build_job_match(
+    entry: Dict,
+    relevant_bullets: List[str],
+    ai_reasoning: Optional[str],
+    reasoning_id: Optional[str] = None,
+    reasoning_status: Optional[str] = None,
+) -> JobMatch:
+    if reasoning_status is None:
+        reasoning_status = "ready" if ai_reasoning is not None else "unavailable"
+    if ai_reasoning is None:
+        ai_reasoning = f"Semantic similarity: {entry['semantic_similarity']:.2%}, Skill match: {entry['skill_match_score']:.2%}"
+
+    # Create match object
+    summary = _ranking_summary(entry)
+    return JobMatch(
+        job_id=summary["job_id"],
+        job=entry["job"],
+        match_score=summary["match_score"],
+        semantic_similarity=summary["semantic_similarity"],
+        skill_match_score=summary["skill_match_score"],
+        ai_reasoning=ai_reasoning,
+        relevant_bullets=relevant_bullets,
+        priority=summary["priority"],
+        reasoning_status=reasoning_status,
+        reasoning_id=reasoning_id,
+    )
+
+
+def _match_summary(match: JobMatch) -> Dict:
+    """_ranking_summary rebuilt from a finished (e.g. cached) JobMatch"""
+    return {
+        "job_id": match.job_id,
+        "title": match.job["title"],
+        "company": match.job["company"],
+        "match_score": match.match_score,
+        "semantic_similarity": match.semantic_similarity,
+        "skill_match_score": match.skill_match_score,
+        "priority": match.priority,
+    }
+
+
+def match_cache_key(
+    artifact_pack,
+    jobs_file_path: str,
+    catalog_version: str,
+    top_k: int,
+    min_similarity: float,
+    filters: Optional[JobFilters] = None,
+    reasoning: str = "eager",
+    reasoning_top_n: int = REASONING_TOP_N,
+) -> str:
+    """
+    Canonical hash of everything a match result depends on. The catalog
+    version (of the snapshot the match runs on) is part of the key, so
+    editing jobs.json invalidates old results.
+    """
+    payload = {
+        "artifact_pack": artifact_pack.model_dump(mode="json"),
+        "jobs_file": os.path.abspath(jobs_file_path),
+        "catalog_version": catalog_version,
+        "top_k": int(top_k),
+        "min_similarity": float(min_similarity),
+        "filters": (
+            filters.model_dump(mode="json")
+            if filters is not None and not filters.is_empty()
+            else None
+        ),
+        "embedding_model": EMBEDDING_MODEL,
+        "reasoning_model": REASONING_MODEL,
+        "reasoning": reasoning,
+        "reasoning_top_n": int(reasoning_top_n) if reasoning == "top_n" else None,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def match_cache_stats() -> Dict:
+    """Hit / miss counters and size of the match result cache"""
+    return _match_cache.stats()
+
+
+async def match_jobs_with_ai(
+    artifact_pack,
+    jobs_file_path: str = "jobs.json",
+    top_k: int = 30,
+    api_key: str = "",
+    min_similarity: float = 0.3,
+    reasoning_concurrency: int = REASONING_CONCURRENCY,
+    reasoning_timeout: float = REASONING_TIMEOUT,
+    reasoning_batch_size: int = REASONING_BATCH_SIZE,
+    filters: Optional[JobFilters] = None,
+    reasoning: str = "eager",
+    reasoning_top_n: int = REASONING_TOP_N,
+    embeddings=None,
+    llm=None,
+) -> List[JobMatch]:
+    """
+    Main AI-powered job matching function using vector embeddings
+
+    Args:
+        artifact_pack: Student artifact pack
+        api_key: Google Gemini API key
+        jobs_file_path: Path to jobs.json
+        top_k: Number of top matches to return
+        min_similarity: Minimum similarity score threshold (0-1)
+        reasoning_concurrency: Max LLM reasoning calls in flight
+        reasoning_timeout: Per-call LLM reasoning timeout in seconds
+        reasoning_batch_size: Jobs per structured-output reasoning request
+        filters: Optional category / experience / employment type /
+            location / remote filters, applied before vector search
+        reasoning: "eager" (LLM reasoning for every match), "lazy" (none;
+            each match gets a reasoning_id for resolve_reasoning) or "top_n"
+            (eager for the first reasoning_top_n matches, lazy after)
+        reasoning_top_n: Matches reasoned eagerly in "top_n" mode
+        embeddings, llm: Embedding / chat backends to use instead of Gemini
+            (e.g. the local stand-ins in benchmarks.fakes)
+
+    Returns:
+        List of JobMatch objects sorted by relevance
+    """
+    matches = []
+    async for event in stream_match_jobs_with_ai(
+        artifact_pack,
+        jobs_file_path=jobs_file_path,
+        top_k=top_k,
+        api_key=api_key,
+        min_similarity=min_similarity,
+        reasoning_concurrency=reasoning_concurrency,
+        reasoning_timeout=reasoning_timeout,
+        reasoning_batch_size=reasoning_batch_size,
+        filters=filters,
+        reasoning=reasoning,
+        reasoning_top_n=reasoning_top_n,
+        embeddings=embeddings,
+        llm=llm,
+    ):
+        if event["event"] == "summary":
+            matches = event["matches"]
+
+    return matches
+
+
+async def stream_match_jobs_with_ai(
+    artifact_pack,
+    jobs_file_path: str = "jobs.json",
+    top_k: int = 30,
+    api_key: str = "",
+    min_similarity: float = 0.3,
+    reasoning_concurrency: int = REASONING_CONCURRENCY,
+    reasoning_timeout: float = REASONING_TIMEOUT,
+    reasoning_batch_size: int = REASONING_BATCH_SIZE,
+    filters: Optional[JobFilters] = None,
+    reasoning: str = "eager",
+    reasoning_top_n: int = REASONING_TOP_N,
+    embeddings=None,
+    llm=None,
+) -> AsyncIterator[Dict]:
+    """
+    Same pipeline as match_jobs_with_ai, yielded as it progresses:
+
+    - {"event": "ranking", "jobs": [...]}: semantic + skill ranking, top_k
+    - {"event": "match", "rank": i, "match": JobMatch}: one per job, in
+      completion order, once its bullets and reasoning are ready
+    - {"event": "summary", "matches": [JobMatch, ...]}: all matches in
+      ranking order
+
+    Lazy matches are emitted right after the ranking, eager ones as their
+    reasoning lands; lazy reasoning ids are then warmed in the background.
+
+    Finished results are cached (see match_cache_key); a repeat request
+    replays the cached matches as the same events.
+    """
+    if reasoning not in REASONING_MODES:
+        raise ValueError(f"reasoning must be one of {', '.join(REASONING_MODES)}")
+
+    # A (re)load parses jobs.json and builds the catalog: not on the loop
+    with stage_timer("catalog_load"):
+        catalog = await asyncio.to_thread(get_catalog(jobs_file_path).snapshot)
+
+    cache_key = match_cache_key(
+        artifact_pack,
+        jobs_file_path,
+        catalog.version,
+        top_k,
+        min_similarity,
+        filters,
+        reasoning,
+        reasoning_top_n,
+    )
+    cached = _match_cache.get(cache_key)
+    if cached is not None:
+        cached = await asyncio.to_thread(_refresh_reasoning, cached)
+        yield {"event": "ranking", "jobs": [_match_summary(m) for m in cached]}
+        for rank, match in enumerate(cached):
+            yield {"event": "match", "rank": rank, "match": match}
+        yield {"event": "summary", "matches": cached}
+        return
+
+    # 1-6. Rank (blocking embedding calls run off the event loop)
+    ranked, job_index, embeddings = await asyncio.to_thread(
+        _rank_jobs,
+        artifact_pack,
+        jobs_file_path,
+        top_k,
+        api_key,
+        min_similarity,
+        filters,
+        embeddings,
+        catalog,
+    )
+    yield {"event": "ranking", "jobs": [_ranking_summary(entry) for entry in ranked]}
+
+    # 7. Rank bullets for all matches against the stored job vectors
+    bullets_per_job = await asyncio.to_thread(
+        _rank_bullets, ranked, job_index, embeddings, artifact_pack
+    )
+
+    if reasoning == "eager":
+        eager_count = len(ranked)
+    elif reasoning == "top_n":
+        eager_count = min(max(0, reasoning_top_n), len(ranked))
+    else:
+        eager_count = 0
+
+    # 8. Lazy matches: reasoning id now, LLM reasoning later (or from cache)
+    matches: List[Optional[JobMatch]] = [None] * len(ranked)
+    reasoning_ids, stored, lazy_reasoning = [], {}, {}
+    if eager_count < len(ranked):
+        reasoning_ids, stored, lazy_reasoning = await asyncio.to_thread(
+            register_lazy_reasoning,
+            [(entry["job"], entry["skill_match"]) for entry in ranked[eager_count:]],
+            artifact_pack,
+        )
+    pending = {}
+    for rank, reasoning_id in enumerate(reasoning_ids, start=eager_count):
+        entry = ranked[rank]
+        ai_reasoning = lazy_reasoning.get(reasoning_id)
+        if ai_reasoning is None:
+            pending[reasoning_id] = stored[reasoning_id]
+        matches[rank] = _build_job_match(
+            entry,
+            bullets_per_job[rank],
+            ai_reasoning,
+            reasoning_id,
+            "ready" if ai_reasoning is not None else "pending",
+        )
+        yield {"event": "match", "rank": rank, "match": matches[rank]}
+
+    # 9. Generate eager AI reasoning concurrently, emitting each match as it lands
+    coroutines = []
+    shared_tasks = set()
+    if eager_count:
+        coroutines = _reasoning_coroutines(
+            [(entry["job"], entry["skill_match"]) for entry in ranked[:eager_count]],
+            artifact_pack,
+            llm or create_reasoning_llm(api_key),
+            reasoning_concurrency,
+            reasoning_timeout,
+            batch_size=reasoning_batch_size,
+            shared_tasks=shared_tasks,
         )
 
-        matches.append(job_match)
+    async def indexed(rank: int, coroutine):
+        return rank, await coroutine
+
+    tasks = [
+        asyncio.ensure_future(indexed(rank, coroutine))
+        for rank, coroutine in enumerate(coroutines)
+    ]
+    reasoning_failures = 0
+    try:
+        # Includes time the consumer spends on each yielded match
+        with stage_timer("llm_reasoning"):
+            for next_done in asyncio.as_completed(tasks):
+                rank, ai_reasoning = await next_done
+                if ai_reasoning is None:
+                    reasoning_failures += 1
+                matches[rank] = _build_job_match(
+                    ranked[rank], bullets_per_job[rank], ai_reasoning
+                )
+                yield {"event": "match", "rank": rank, "match": matches[rank]}
+    finally:
+        # Client went away mid-stream: stop the remaining LLM calls, and the
+        # cache lookup and batch requests they share
+        for task in chain(tasks, shared_tasks):
+            task.cancel()
+
+    # Don't pin fallback reasoning from failed / timed out LLM calls
+    if not reasoning_failures:
+        _match_cache.set(cache_key, list(matches))
+
+    _schedule_background_reasoning(pending, api_key, reasoning_timeout, llm)
+
+    yield {"event": "summary", "matches": matches}
+
+
+async def match_jobs_batch(
+    artifact_packs: List,
+    jobs_file_path: str = "jobs.json",
+    top_k: int = 30,
+    api_key: str = "",
+    min_similarity: float = 0.3,
+    filters: Optional[JobFilters] = None,
+    include_reasoning: bool = False,
+    reasoning_concurrency: int = REASONING_CONCURRENCY,
+    reasoning_timeout: float = REASONING_TIMEOUT,
+    reasoning_batch_size: int = REASONING_BATCH_SIZE,
+    embeddings=None,
+    llm=None,
+) -> List[List[JobMatch]]:
+    """
+    match_jobs_with_ai for many students in one pass over the catalog.
+
+    Profiles and bullet banks are embedded in one batched call each and all
+    students are scored against the job matrix at once. LLM reasoning is
+    off by default (the score summary is used instead); with
+    include_reasoning, all students share one reasoning_concurrency limit.
 
-    # 7. Sort by match score
-    matches.sort(key=lambda x: x.match_score, reverse=True)
+    Returns one list of JobMatch objects per artifact pack, in input order.
+    """
+    if not artifact_packs:
+        return []
 
-    # 8. Return top k
-    return matches[:top_k]
+    rankings, job_index, embeddings = await asyncio.to_thread(
+        _rank_jobs_batch,
+        artifact_packs,
+        jobs_file_path,
+        top_k,
+        api_key,
+        min_similarity,
+        filters,
+        embeddings,
+    )
+    with stage_timer("bullet_ranking"):
+        bullets = await asyncio.to_thread(
+            _rank_bullets_batch, rankings, job_index, embeddings, artifact_packs
+        )
+
+    reasoning = [[None] * len(ranked) for ranked in rankings]
+    if include_reasoning:
+        llm = llm or create_reasoning_llm(api_key)
+        semaphore = asyncio.Semaphore(max(1, reasoning_concurrency))
+        with stage_timer("llm_reasoning"):
+            reasoning = await asyncio.gather(
+                *(
+                    asyncio.gather(
+                        *_reasoning_coroutines(
+                            [(entry["job"], entry["skill_match"]) for entry in ranked],
+                            pack,
+                            llm,
+                            reasoning_concurrency,
+                            reasoning_timeout,
+                            semaphore,
+                            reasoning_batch_size,
+                        )
+                    )
+                    for ranked, pack in zip(rankings, artifact_packs)
+                )
+            )
+
+    return [
+        [
+            _build_job_match(
+                entry,
+                entry_bullets,
+                ai_reasoning,
+                reasoning_status=None if include_reasoning else "skipped",
+            )
+            for entry, entry_bullets, ai_reasoning in zip(
+                ranked, pack_bullets, pack_reasoning
+            )
+        ]
+        for ranked, pack_bullets, pack_reasoning in zip(rankings, bullets, reasoning)
+    ]
 
 
 def create_ai_apply_queue(matches: List[JobMatch]) -> Dict:
@@ -382,6 +1388,8 @@ def create_ai_apply_queue(matches: List[JobMatch]) -> Dict:
                 "ai_reasoning": m.ai_reasoning,
                 "relevant_bullets": m.relevant_bullets,
                 "priority": m.priority,
+                "reasoning_status": m.reasoning_status,
+                "reasoning_id": m.reasoning_id,
             }
             for m in matches
         ],
@@ -0,0 +1,167 @@
+"""
+In-process latency histograms and external call counters, rendered in the
+Prometheus text format for /metrics.
+
+Metrics are per process; with several uvicorn workers each one reports its
+own (scrape them individually or aggregate by instance).
+"""
+
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Add a Server-Timing header with the stages of each request
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() in ("1", "true", "yes")
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (stage, seconds) recorded while serving the current request
+_request_timings: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = (
+    contextvars.ContextVar("request_timings", default=None)
+)
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # bucket counts, then +Inf count and sum
+                series = self._series[label_values] = [0.0] * (len(DURATION_BUCKETS) + 2)
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, series in sorted(self._series.items()):
+                labels = _labels(self.labels, label_values)
+                for bound, count in zip(DURATION_BUCKETS, series):
+                    lines.append(
+                        f'{self.name}_bucket{{{labels}{"," if labels else ""}le="{bound}"}} {count:g}'
+                    )
+                lines.append(
+                    f'{self.name}_bucket{{{labels}{"," if labels else ""}le="+Inf"}} {series[-2]:g}'
+                )
+                lines.append(f"{self.name}_sum{{{labels}}} {series[-1]:.6f}")
+                lines.append(f"{self.name}_count{{{labels}}} {series[-2]:g}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter per label set"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(
+                    f"{self.name}{{{_labels(self.labels, label_values)}}} {value:g}"
+                )
+        return lines
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    def escape(value: str) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+
+
+STAGE_DURATION = Histogram(
+    "stage_duration_seconds", "Wall time of pipeline stages", ("stage",)
+)
+EXTERNAL_CALLS = Counter(
+    "external_calls_total",
+    "Calls to external services (embeddings, llm, github, scrape)",
+    ("service", "outcome"),
+)
+EXTERNAL_CALL_DURATION = Histogram(
+    "external_call_duration_seconds", "Wall time of external calls", ("service",)
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Wall time of HTTP requests",
+    ("method", "route", "status"),
+)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Record the wall time of a block as a pipeline stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_DURATION.observe(elapsed, stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+
+@contextmanager
+def external_call(service: str, count: int = 1) -> Iterator[None]:
+    """Count (and time) `count` calls to an external service made by a block"""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        EXTERNAL_CALLS.inc(service, "error", amount=count)
+        raise
+    else:
+        EXTERNAL_CALLS.inc(service, "ok", amount=count)
+    finally:
+        EXTERNAL_CALL_DURATION.observe(time.perf_counter() - start, service)
+
+
+def start_request_timings() -> List[Tuple[str, float]]:
+    """Collect stage timings for the request running in this context"""
+    timings: List[Tuple[str, float]] = []
+    _request_timings.set(timings)
+    return timings
+
+
+def server_timing_header(timings: List[Tuple[str, float]], total: float) -> str:
+    """Server-Timing value; repeated stages are summed, durations in ms"""
+    totals: Dict[str, float] = {}
+    for stage, elapsed in timings:
+        totals[stage] = totals.get(stage, 0.0) + elapsed
+    entries = [f"{stage};dur={elapsed * 1000:.1f}" for stage, elapsed in totals.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def render_prometheus() -> str:
+    lines: List[str] = []
+    for metric in (STAGE_DURATION, EXTERNAL_CALLS, EXTERNAL_CALL_DURATION, REQUEST_DURATION):
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -176,3 +176,37 @@ class ArtifactPack(BaseModel):
         default_factory=list,
         description="3-8 strongest links - must be actual URLs found in source material",
     )
+
+
+class JobFilters(BaseModel):
+    """Optional catalog filters applied before vector search"""
+
+    category: Optional[str] = Field(default=None, description="e.g. 'tech', 'non-tech'")
+    experience_level: Optional[str] = Field(default=None, description="e.g. 'Intern', 'Entry'")
+    employment_type: Optional[str] = Field(default=None, description="e.g. 'Internship', 'Full-time'")
+    location: Optional[str] = Field(
+        default=None, description="Case-insensitive substring of the job location"
+    )
+    remote: Optional[bool] = Field(
+        default=None, description="True for remote jobs only, False to exclude them"
+    )
+
+    def is_empty(self) -> bool:
+        return all(value is None for value in self.model_dump().values())
+
+
+class MatchReasoning(BaseModel):
+    """LLM reasoning for one job in a batched reasoning prompt"""
+
+    job_id: str = Field(description="EXACT job_id of the job this reasoning is for")
+    reasoning: str = Field(
+        description="2-3 sentences on why this is a good or poor match"
+    )
+
+
+class MatchReasoningBatch(BaseModel):
+    """Reasoning for every job in a batched reasoning prompt"""
+
+    items: List[MatchReasoning] = Field(
+        description="One entry per job in the prompt, in the same order"
+    )
@@ -1,5 +1,7 @@
 from typing import List, Dict
 
+from metrics import stage_timer
+
 
 def _score_bullet_against_job(bullet_text: str, job_requirements: List[str]) -> int:
     """
@@ -23,6 +25,7 @@ def _clean_text(text: str) -> str:
     return " ".join(text.replace("\n", " ").split())
 
 
+@stage_timer("recruiter_notes")
 def generate_recruiter_notes(
     artifact: Dict, jobs: List[Dict], max_bullets: int = 3
 ) -> List[Dict]:
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from cache import SQLiteCache
+
+REASONING_CACHE_PATH = os.getenv("REASONING_CACHE_PATH", ".cache/reasoning.sqlite3")
+REASONING_CACHE_SIZE = int(os.getenv("REASONING_CACHE_SIZE", "50000"))
+# Prompts behind lazy reasoning ids, bounded like the reasoning itself
+REASONING_PROMPTS_PATH = os.getenv(
+    "REASONING_PROMPTS_PATH", ".cache/reasoning_prompts.sqlite3"
+)
+REASONING_PROMPTS_SIZE = int(os.getenv("REASONING_PROMPTS_SIZE", "50000"))
+
+_cache: Optional[SQLiteCache] = None
+_prompt_cache: Optional[SQLiteCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_reasoning_cache() -> SQLiteCache:
+    """Process-wide handle on the shared reasoning cache file"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SQLiteCache(REASONING_CACHE_PATH, REASONING_CACHE_SIZE)
+        return _cache
+
+
+def get_prompt_cache() -> SQLiteCache:
+    """Process-wide handle on the shared lazy reasoning prompt file"""
+    global _prompt_cache
+    with _cache_lock:
+        if _prompt_cache is None:
+            _prompt_cache = SQLiteCache(REASONING_PROMPTS_PATH, REASONING_PROMPTS_SIZE)
+        return _prompt_cache
+
+
+def reasoning_cache_key(prompt: str, model: str) -> str:
+    return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+def get_cached_reasoning(prompt: str, model: str) -> Optional[str]:
+    """Previously generated reasoning for this exact prompt and model"""
+    return get_reasoning_cache().get(reasoning_cache_key(prompt, model))
+
+
+def get_cached_reasonings(prompts: Sequence[str], model: str) -> List[Optional[str]]:
+    """get_cached_reasoning for several prompts in one cache read"""
+    keys = [reasoning_cache_key(prompt, model) for prompt in prompts]
+    found = get_reasoning_cache().get_many(keys)
+    return [found.get(key) for key in keys]
+
+
+def get_reasoning_by_id(reasoning_id: str) -> Optional[str]:
+    """Cached reasoning by its key (the lazy reasoning id handed to clients)"""
+    return get_reasoning_cache().get(reasoning_id)
+
+
+def get_reasonings_by_id(reasoning_ids: Sequence[str]) -> Dict[str, str]:
+    """Cached reasoning of the ids that have some, in one cache read"""
+    return get_reasoning_cache().get_many(reasoning_ids)
+
+
+def store_reasoning(prompt: str, model: str, reasoning: str) -> None:
+    get_reasoning_cache().set(reasoning_cache_key(prompt, model), reasoning)
+
+
+def store_reasonings(items: Sequence[Tuple[str, str]], model: str) -> None:
+    """store_reasoning for several (prompt, reasoning) pairs in one write"""
+    get_reasoning_cache().set_many(
+        (reasoning_cache_key(prompt, model), reasoning) for prompt, reasoning in items
+    )
+
+
+def store_reasoning_prompts(stored: Dict[str, Dict]) -> None:
+    """Save {"job_id", "prompt"} by lazy reasoning id, in one write"""
+    get_prompt_cache().set_many(
+        (reasoning_id, json.dumps(item)) for reasoning_id, item in stored.items()
+    )
+
+
+def get_reasoning_prompts(reasoning_ids: Sequence[str]) -> Dict[str, Dict]:
+    """Stored prompts of the lazy reasoning ids that have one, in one read"""
+    found = get_prompt_cache().get_many(reasoning_ids)
+    return {reasoning_id: json.loads(item) for reasoning_id, item in found.items()}
@@ -0,0 +1,63 @@
+from typing import Dict, List
+
+
+def score_sandbox_entry(entry: Dict, note: str) -> Dict:
+    """
+    Sandbox recruiter decision for one apply-queue entry and its short note.
+    """
+    job = entry["job"]
+    job_id = job["job_id"]
+
+    # HARD SAFETY GATE
+    if not job.get("automation_allowed", False):
+        return {"job_id": job_id, "signal": "failure"}
+
+    # -----------------------------
+    # Extract & normalize scores
+    # -----------------------------
+    semantic = entry.get("semantic_similarity", 0) / 100
+    skill = entry.get("skill_match_score", 0) / 100
+    match = entry.get("match_score", 0) / 100
+
+    # Base confidence (reuse Part-2 signals)
+    confidence = 0.40 * semantic + 0.35 * skill + 0.25 * match
+
+    # -----------------------------
+    # Recruiter-note sanity check
+    # -----------------------------
+    note = note.lower()
+    matched_terms = sum(
+        1 for req in job.get("requirements", []) if req.lower() in note
+    )
+
+    # Penalize slightly if note is weak
+    if matched_terms == 0:
+        confidence *= 0.85
+
+    confidence = round(confidence, 3)
+
+    # -----------------------------
+    # Decision thresholds
+    # -----------------------------
+    if confidence >= 0.25:
+        signal = "success"
+    elif confidence >= 0.23:
+        signal = "processing"
+    else:
+        signal = "failure"
+
+    return {"job_id": job_id, "signal": signal, "confidence": confidence}
+
+
+def score_sandbox_batch(job_entries: List[Dict], notes_list: List[Dict]) -> List[Dict]:
+    """
+    Sandbox recruiter decisions for apply-queue entries.
+    Returns list of job_id + signal (success | processing | failure)
+    """
+    # Build job_id -> short_note map
+    notes_map = {n["job_id"]: n["short_note"] for n in notes_list}
+
+    return [
+        score_sandbox_entry(entry, notes_map.get(entry["job"]["job_id"], ""))
+        for entry in job_entries
+    ]
@@ -0,0 +1,124 @@
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+
+def normalize_skill(skill: str) -> str:
+    """Normalize skills to lowercase for better matching"""
+    return skill.lower().strip()
+
+
+class SkillScores:
+    """Skill overlap of one student against every row of a SkillMatrix"""
+
+    def __init__(self, matrix: "SkillMatrix", hits: np.ndarray):
+        self.matrix = matrix
+        self.hits = hits
+        self.counts = np.bincount(
+            matrix.nnz_rows, weights=hits, minlength=len(matrix)
+        ).astype(np.int32)
+        self.totals = matrix.totals
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.percentages = np.where(
+                self.totals > 0, self.counts / self.totals * 100, 100.0
+            )
+
+    def overlap(self, row: int) -> List[str]:
+        start, end = self.matrix.indptr[row], self.matrix.indptr[row + 1]
+        ids = self.matrix.indices[start:end][self.hits[start:end]]
+        return [self.matrix.skills[i] for i in ids]
+
+    def missing(self, row: int) -> List[str]:
+        start, end = self.matrix.indptr[row], self.matrix.indptr[row + 1]
+        ids = self.matrix.indices[start:end][~self.hits[start:end]]
+        return [self.matrix.skills[i] for i in ids]
+
+    def as_dict(self, row: int) -> Dict:
+        """Same shape as calculate_skill_overlap"""
+        return {
+            "overlap": self.overlap(row),
+            "missing": self.missing(row),
+            "percentage": float(self.percentages[row]),
+        }
+
+
+class SkillMatrix:
+    """
+    Job x skill incidence matrix in CSR form (indptr / indices), one row
+    per job in catalog order, duplicate requirements collapsed.
+    """
+
+    def __init__(self, jobs: Iterable[Dict]):
+        self._build(job.get("requirements", []) for job in jobs)
+
+    @classmethod
+    def from_requirements(cls, rows: Iterable[Iterable[str]]) -> "SkillMatrix":
+        """Build from each job's requirement list instead of job dicts"""
+        matrix = cls.__new__(cls)
+        matrix._build(rows)
+        return matrix
+
+    def _build(self, rows: Iterable[Iterable[str]]) -> None:
+        self.skill_ids: Dict[str, int] = {}
+        self.skills: List[str] = []
+        indptr = [0]
+        indices: List[int] = []
+
+        for requirements in rows:
+            row = dict.fromkeys(
+                self._skill_id(normalize_skill(skill)) for skill in requirements
+            )
+            indices.extend(row)
+            indptr.append(len(indices))
+
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.totals = np.diff(self.indptr).astype(np.int32)
+        self.nnz_rows = np.repeat(np.arange(len(self.totals)), self.totals)
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    def _skill_id(self, skill: str) -> int:
+        if skill not in self.skill_ids:
+            self.skill_ids[skill] = len(self.skills)
+            self.skills.append(skill)
+        return self.skill_ids[skill]
+
+    def encode(self, student_skills: Iterable[str]) -> np.ndarray:
+        """Boolean vector over the skill vocabulary (unknown skills ignored)"""
+        vector = np.zeros(len(self.skills), dtype=bool)
+        for skill in student_skills:
+            skill_id = self.skill_ids.get(normalize_skill(skill))
+            if skill_id is not None:
+                vector[skill_id] = True
+        return vector
+
+    def score(self, student_skills: Iterable[str]) -> SkillScores:
+        """Overlap counts and percentages for every job in one pass"""
+        return SkillScores(self, self.encode(student_skills)[self.indices])
+
+    def row_overlap(self, row: int, student_skills: Iterable[str]) -> Dict:
+        """Overlap of one job only, same shape as calculate_skill_overlap"""
+        student = {normalize_skill(skill) for skill in student_skills}
+        start, end = self.indptr[row], self.indptr[row + 1]
+        requirements = [self.skills[i] for i in self.indices[start:end]]
+        overlap = [skill for skill in requirements if skill in student]
+        return {
+            "overlap": overlap,
+            "missing": [skill for skill in requirements if skill not in student],
+            "percentage": (
+                len(overlap) / len(requirements) * 100 if requirements else 100.0
+            ),
+        }
+
+
+def calculate_skill_overlap(
+    job_requirements: List[str], student_skills: List[str]
+) -> Dict:
+    """
+    Calculate skill overlap percentage for a single job.
+    Returns: { "overlap": [], "missing": [], "percentage": float }
+    """
+    matrix = SkillMatrix([{"requirements": job_requirements}])
+    return matrix.row_overlap(0, student_skills)
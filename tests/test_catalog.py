@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from catalog import IngestStats, iter_jobs_from_file
+
+
+def _job(i: int, **fields):
+    return {"job_id": f"j{i}", "title": "Data Engineer", "company": "Acme", **fields}
+
+
+def _load(path):
+    stats = IngestStats()
+    return [job["job_id"] for job in iter_jobs_from_file(str(path), stats)], stats
+
+
+def _write(path, text: str):
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _lines(count: int) -> str:
+    return "\n".join(json.dumps(_job(i)) for i in range(count)) + "\n"
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        [_job(i) for i in range(3)],
+        {"jobs": [_job(i) for i in range(3)]},
+        {"source": "feed", "jobs": [_job(i) for i in range(3)]},
+    ],
+)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_json_documents(tmp_path, document, indent):
+    path = _write(tmp_path / "jobs.json", json.dumps(document, indent=indent))
+    assert _load(path)[0] == ["j0", "j1", "j2"]
+
+
+def test_jsonl_without_extension(tmp_path):
+    ids, stats = _load(_write(tmp_path / "jobs.json", "\n" + _lines(3)))
+    assert ids == ["j0", "j1", "j2"]
+    assert stats.skipped_total == 0
+
+
+def test_jsonl_bad_first_line_is_skipped(tmp_path):
+    for name in ("jobs.jsonl", "jobs.json"):
+        ids, stats = _load(_write(tmp_path / name, "{oops\n" + _lines(3)))
+        assert ids == ["j0", "j1", "j2"]
+        assert stats.skipped == {"invalid JSON": 1}
+
+
+def test_jsonl_long_first_line(tmp_path):
+    first = json.dumps(_job(99, description="x" * 200_000))
+    ids, _ = _load(_write(tmp_path / "jobs.json", first + "\n" + _lines(2)))
+    assert ids == ["j99", "j0", "j1"]
+
+
+def test_jsonl_extension_reads_lines(tmp_path):
+    text = json.dumps([_job(50)]) + "\n" + _lines(2)
+    ids, stats = _load(_write(tmp_path / "jobs.ndjson", text))
+    assert ids == ["j0", "j1"]
+    assert stats.skipped == {"not an object": 1}
+
+
+def test_one_line_object_without_jobs_is_rejected(tmp_path):
+    path = _write(tmp_path / "jobs.json", json.dumps({"data": [_job(0)]}))
+    with pytest.raises(ValueError, match="Invalid jobs.json format"):
+        _load(path)
+
+
+def test_non_list_jobs_is_rejected(tmp_path):
+    path = _write(tmp_path / "jobs.json", json.dumps({"jobs": 5}))
+    with pytest.raises(ValueError, match="Invalid jobs.json format"):
+        _load(path)
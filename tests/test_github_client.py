@@ -0,0 +1,108 @@
+import asyncio
+import http.server
+import json
+import threading
+import urllib.parse
+
+import httpx
+import pytest
+
+from github_client import GitHubClient
+
+_REPO_PAGES = 3
+
+
+class _StubGitHub(http.server.BaseHTTPRequestHandler):
+    """Serves one user with paginated repos, ETags and 304s"""
+
+    requests = []
+    not_modified = 0
+    status = None
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        self.requests.append((url.path, self.headers.get("If-None-Match")))
+        if self.status:
+            self.send_response(self.status)
+            self.end_headers()
+            return
+
+        headers = {}
+        if url.path == "/users/octo":
+            body, etag = {"login": "octo", "name": "Octo"}, '"profile"'
+        else:
+            page = int(urllib.parse.parse_qs(url.query)["page"][0])
+            body = [{"name": f"repo-{page}-{i}"} for i in range(2)]
+            etag = f'"repos-{page}"'
+            host, port = self.server.server_address
+            headers["Link"] = (
+                f'<http://{host}:{port}/users/octo/repos?per_page=100&page={_REPO_PAGES}>; '
+                'rel="last"'
+            )
+
+        if self.headers.get("If-None-Match") == etag:
+            _StubGitHub.not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_github():
+    _StubGitHub.requests = []
+    _StubGitHub.not_modified = 0
+    _StubGitHub.status = None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _StubGitHub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    yield f"http://{host}:{port}"
+    server.shutdown()
+    server.server_close()
+
+
+def _fetch(base_url: str, cache_dir: str, ttl: float):
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            github = GitHubClient(client, base_url=base_url, cache_dir=cache_dir, ttl=ttl)
+            return await github.fetch_user("octo")
+
+    return asyncio.run(fetch())
+
+
+def test_fetches_every_repo_page(stub_github, tmp_path):
+    profile, repos = _fetch(stub_github, str(tmp_path), ttl=60)
+    assert profile["login"] == "octo"
+    assert len(repos) == 2 * _REPO_PAGES
+    assert len(_StubGitHub.requests) == 1 + _REPO_PAGES
+
+
+def test_fresh_entries_skip_the_network(stub_github, tmp_path):
+    _fetch(stub_github, str(tmp_path), ttl=60)
+    _StubGitHub.requests.clear()
+    _, repos = _fetch(stub_github, str(tmp_path), ttl=60)
+    assert len(repos) == 2 * _REPO_PAGES
+    assert _StubGitHub.requests == []
+
+
+def test_stale_entries_revalidate_with_etag(stub_github, tmp_path):
+    first = _fetch(stub_github, str(tmp_path), ttl=60)
+    _StubGitHub.requests.clear()
+    assert _fetch(stub_github, str(tmp_path), ttl=0) == first
+    # Every request carried the cached ETag and was answered with a 304
+    assert all(etag for _, etag in _StubGitHub.requests)
+    assert _StubGitHub.not_modified == len(_StubGitHub.requests) == 1 + _REPO_PAGES
+
+
+def test_rate_limited_serves_stale_copy(stub_github, tmp_path):
+    first = _fetch(stub_github, str(tmp_path), ttl=60)
+    _StubGitHub.status = 403
+    assert _fetch(stub_github, str(tmp_path), ttl=0) == first
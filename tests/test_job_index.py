@@ -0,0 +1,62 @@
+import os
+
+from langchain_core.documents import Document
+
+import job_index
+from benchmarks.fakes import HashEmbeddings
+
+
+def _documents(catalog: str, count: int):
+    return [
+        Document(page_content=f"{catalog} python developer {i}", metadata={"row": i})
+        for i in range(count)
+    ]
+
+
+def _versions(index_dir: str):
+    model_dir = job_index._model_dir(job_index.EMBEDDING_MODEL, index_dir)
+    return job_index._saved_versions(model_dir)
+
+
+def test_alternating_catalogs_are_embedded_once(tmp_path):
+    embeddings = HashEmbeddings(dim=16)
+    a, b = _documents("alpha", 40), _documents("beta", 30)
+
+    for documents in (a, b, a, b, a):
+        index = job_index.load_job_index(documents, embeddings, index_dir=str(tmp_path))
+        assert len(index) == len(documents)
+    assert embeddings.documents_embedded == 70
+
+    # A new catalog mixing both only embeds its own jobs, also after a restart
+    job_index._loaded.clear()
+    mixed = a[:10] + b[:10] + _documents("gamma", 5)
+    job_index.load_job_index(mixed, embeddings, index_dir=str(tmp_path))
+    assert embeddings.documents_embedded == 75
+
+
+def test_reused_vectors_match_fresh_embeddings(tmp_path):
+    embeddings = HashEmbeddings(dim=16)
+    a, b = _documents("alpha", 20), _documents("beta", 20)
+    job_index.load_job_index(a, embeddings, index_dir=str(tmp_path))
+    job_index.load_job_index(b, embeddings, index_dir=str(tmp_path))
+
+    mixed = b[5:] + a[:5]
+    index = job_index.load_job_index(mixed, embeddings, index_dir=str(tmp_path))
+    fresh = job_index.normalize_rows(
+        HashEmbeddings(dim=16).embed_documents([doc.page_content for doc in mixed])
+    )
+    assert (index.job_vectors(range(len(mixed))) == fresh).all()
+
+
+def test_prune_keeps_recent_versions_and_skips_temporary_files(tmp_path):
+    embeddings = HashEmbeddings(dim=16)
+    model_dir = job_index._model_dir(job_index.EMBEDDING_MODEL, str(tmp_path))
+    for i in range(5):
+        job_index.load_job_index(_documents(f"v{i}", 3), embeddings, index_dir=str(tmp_path))
+        if i == 0:
+            # A write another worker has in progress
+            in_progress = os.path.join(model_dir, "vectors-0123abcd.npy.1.2.tmp")
+            open(in_progress, "w").close()
+
+    assert len(_versions(str(tmp_path))) == job_index._KEEP_VERSIONS + 1
+    assert os.path.exists(in_progress)